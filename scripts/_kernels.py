@@ -0,0 +1,92 @@
+"""Numeric kernels shared by the analysis scripts.
+
+The kernels are compiled with Numba when it is installed; otherwise they
+run as plain NumPy code with identical results.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    def njit(*args, **kwargs):
+        """Stand-in for numba.njit that returns the function unchanged."""
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+@njit(cache=True)
+def p95(values):
+    """95th percentile with linear interpolation, matching np.percentile."""
+    n = values.size
+    if n == 0:
+        return 0.0
+
+    rank = 0.95 * (n - 1)
+    lo = int(rank)
+    part = np.partition(values, lo)
+    lower = part[lo]
+    if lo + 1 >= n:
+        return lower
+
+    # Everything after the partition point is >= lower; its minimum is the
+    # next order statistic
+    upper = part[lo + 1:].min()
+    t = rank - lo
+    if t >= 0.5:
+        return upper - (upper - lower) * (1 - t)
+    return lower + (upper - lower) * t
+
+@njit(cache=True)
+def clip(tput, cap):
+    """Return the throughput series clipped to cap; NaN samples stay NaN."""
+    out = np.empty_like(tput)
+    for i in range(tput.size):
+        v = tput[i]
+        out[i] = cap if v > cap else v
+
+    return out
+
+@njit(cache=True)
+def lttb(x, y, n_out=2000):
+    """Downsample (x, y) to n_out points with Largest-Triangle-Three-Buckets.
+
+    Series that already have n_out points or fewer are returned unchanged.
+    """
+    n = x.size
+    if n <= n_out or n_out < 3:
+        return x.copy(), y.copy()
+
+    out_x = np.empty(n_out)
+    out_y = np.empty(n_out)
+    out_x[0] = x[0]
+    out_y[0] = y[0]
+
+    # The first and last points are kept; the rest are split into buckets
+    every = (n - 2) / (n_out - 2)
+    a = 0
+    for i in range(n_out - 2):
+        # Average of the next bucket is the third vertex of the triangle
+        avg_start = int((i + 1) * every) + 1
+        avg_end = min(int((i + 2) * every) + 1, n)
+        avg_x = x[avg_start:avg_end].mean()
+        avg_y = y[avg_start:avg_end].mean()
+
+        # Keep the point in this bucket that forms the largest triangle
+        start = int(i * every) + 1
+        end = int((i + 1) * every) + 1
+        max_area = -1.0
+        chosen = start
+        for j in range(start, end):
+            area = abs((x[a] - avg_x) * (y[j] - y[a]) - (x[a] - x[j]) * (avg_y - y[a]))
+            if area > max_area:
+                max_area = area
+                chosen = j
+
+        out_x[i + 1] = x[chosen]
+        out_y[i + 1] = y[chosen]
+        a = chosen
+
+    out_x[n_out - 1] = x[n - 1]
+    out_y[n_out - 1] = y[n - 1]
+    return out_x, out_y
@@ -0,0 +1,84 @@
+"""Loaders for the per-experiment data files shared by the analysis scripts.
+
+CSV parsing uses pyarrow's multithreaded streaming reader when it is
+installed and falls back to chunked pandas reads otherwise. JSON is
+parsed with orjson when available.
+"""
+
+import json
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pacsv
+except ImportError:
+    pa = pacsv = None
+
+CSV_COLUMNS = ['time', 'throughput', 'delay', 'loss']
+
+# Upper bound on rows kept per series; plots downsample further with LTTB
+MAX_SERIES_POINTS = 20000
+
+def load_result_json(path):
+    """Load an experiment's result.json summary."""
+    with open(path, 'rb') as f:
+        data = f.read()
+    return orjson.loads(data) if orjson is not None else json.loads(data)
+
+def _iter_batches(path, chunksize=65536):
+    """Yield a throughput CSV as float64 DataFrame batches of the known columns."""
+    if pacsv is None:
+        yield from pd.read_csv(path, usecols=lambda c: c in CSV_COLUMNS,
+                               dtype=np.float64, chunksize=chunksize)
+        return
+
+    reader = pacsv.open_csv(
+        path,
+        read_options=pacsv.ReadOptions(use_threads=True),
+        convert_options=pacsv.ConvertOptions(
+            column_types={c: pa.float64() for c in CSV_COLUMNS}))
+    for batch in reader:
+        names = [c for c in batch.schema.names if c in CSV_COLUMNS]
+        yield batch.select(names).to_pandas()
+
+def load_throughput_series(path, max_points=MAX_SERIES_POINTS):
+    """Stream a throughput CSV without materializing every row.
+
+    Returns the series decimated to at most max_points rows for plotting,
+    and the full delay column (None if absent) for the percentile stats.
+    """
+    kept = []
+    delays = []
+    stride = 1
+    n_rows = 0
+    n_kept = 0
+
+    for batch in _iter_batches(path):
+        batch.index = pd.RangeIndex(n_rows, n_rows + len(batch))
+        n_rows += len(batch)
+        if 'delay' in batch.columns:
+            delays.append(batch['delay'].to_numpy())
+
+        batch = batch[batch.index % stride == 0]
+        kept.append(batch)
+        n_kept += len(batch)
+
+        # Halve the plotting resolution until the kept rows fit again
+        while n_kept > max_points:
+            stride *= 2
+            kept = [k[k.index % stride == 0] for k in kept]
+            n_kept = sum(len(k) for k in kept)
+
+    if not kept:
+        return pd.DataFrame(columns=CSV_COLUMNS, dtype=np.float64), None
+
+    series = pd.concat(kept, ignore_index=True)
+    delay = np.concatenate(delays) if delays else None
+    return series, delay
@@ -1,19 +1,28 @@
 #!/usr/bin/env python3
 
 import os
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import glob
-import json
 import argparse
 
+# For localhost testing with artificial limits, throughput is capped per profile
+THROUGHPUT_CAPS = {
+    'profile1': 50,  # 50 Mbps limit
+    'profile2': 1,   # 1 Mbps limit
+}
+
 def analyze_results(data_dir, output_dir):
     """Analyze experiment results and generate graphs."""
-    # Find all result files
-    result_files = glob.glob(f"{data_dir}/*/result.json")
+    # Find all experiment directories with a result file, listing each
+    # directory once instead of probing individual paths
+    experiments = []
+    if os.path.isdir(data_dir):
+        for entry in os.scandir(data_dir):
+            if not entry.is_dir() or '_' not in entry.name:
+                continue
+            names = {f.name: f.path for f in os.scandir(entry.path)}
+            if 'result.json' in names:
+                experiments.append((entry.name, names))
     
-    if not result_files:
+    if not experiments:
         print(f"No result files found in {data_dir}")
         print("Checking if data might be in root user's directory...")
         
@@ -24,63 +33,89 @@ def analyze_results(data_dir, output_dir):
             
         return 1
     
+    # Deferred so the "no results" exit above does not pay for these imports
+    import pandas as pd
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from _kernels import clip, lttb
+    from _loaders import CSV_COLUMNS, load_result_json, load_throughput_series
+    
     # Process result files
     results = {}
-    for result_file in result_files:
-        # Extract profile and scheme from directory path
-        dir_path = os.path.dirname(result_file)
-        dir_name = os.path.basename(dir_path)
-        
-        if '_' not in dir_name:
-            continue
-            
-        profile, scheme = dir_name.split('_', 1)
+    delays = []
+    for dir_name, names in experiments:
+        # Extract profile and scheme from directory name
+        profile, _, scheme = dir_name.partition('_')
+        result_file = names['result.json']
         
         # Load result data
         try:
-            with open(result_file, 'r') as f:
-                result_data = json.load(f)
+            result_data = load_result_json(result_file)
         except Exception as e:
             print(f"Error loading {result_file}: {e}")
             continue
         
         # Load throughput data
-        throughput_file = f"{dir_path}/{scheme}_throughput.csv"
-        if os.path.exists(throughput_file):
+        throughput_file = names.get(f"{scheme}_throughput.csv")
+        if throughput_file is not None:
             try:
-                throughput_data = pd.read_csv(throughput_file)
+                throughput_data, delay = load_throughput_series(throughput_file)
+                # Missing columns become NaN; the time-series plots skip
+                # schemes whose CSV lacked the columns they need
+                has_throughput = {'time', 'throughput'}.issubset(throughput_data.columns)
+                has_loss = {'time', 'loss'}.issubset(throughput_data.columns)
+                throughput_data = throughput_data.reindex(columns=CSV_COLUMNS)
             except Exception as e:
                 print(f"Error loading {throughput_file}: {e}")
-                throughput_data = pd.DataFrame(columns=['time', 'throughput', 'delay', 'loss'])
+                throughput_data = pd.DataFrame(columns=CSV_COLUMNS, dtype=np.float64)
+                delay = np.empty(0)
+                has_throughput = has_loss = False
         else:
             print(f"No throughput data found for {profile}_{scheme}")
-            throughput_data = pd.DataFrame(columns=['time', 'throughput', 'delay', 'loss'])
+            throughput_data = pd.DataFrame(columns=CSV_COLUMNS, dtype=np.float64)
+            delay = np.empty(0)
+            has_throughput = has_loss = False
         
         # Store results
         if profile not in results:
             results[profile] = {}
             
         # For localhost testing with artificial limits, adjust throughput based on profile
-        if profile == 'profile1':
-            # 50 Mbps limit
-            adjusted_throughput = min(result_data.get('avg_throughput', 0), 50)
-        elif profile == 'profile2':
-            # 1 Mbps limit
-            adjusted_throughput = min(result_data.get('avg_throughput', 0), 1)
-        else:
-            adjusted_throughput = result_data.get('avg_throughput', 0)
+        cap = float(THROUGHPUT_CAPS.get(profile, np.inf))
+        adjusted_throughput = min(result_data.get('avg_throughput', 0), cap)
+        
+        throughput_data['throughput'] = clip(throughput_data['throughput'].to_numpy(), cap)
         
         results[profile][scheme] = {
             'avg_throughput': adjusted_throughput,
             'avg_delay': result_data.get('avg_delay', 0),
             'loss_rate': result_data.get('loss_rate', 0),
-            'throughput_data': throughput_data
+            'throughput_data': throughput_data,
+            'has_throughput': has_throughput,
+            'has_loss': has_loss
         }
+        
+        # The 95th percentile RTT is filled in for all schemes after the loop
+        delays.append((results[profile][scheme], delay if delay is not None else np.empty(0)))
     
     if not results:
         print("No valid results found to analyze")
         return 1
     
+    # Compute every scheme's 95th percentile RTT in one call over the delay
+    # columns, NaN-padded to a common length; schemes without delay data get 0
+    sizes = np.array([d.size for _, d in delays])
+    has_delay = sizes > 0
+    p95s = np.zeros(len(delays))
+    if has_delay.any():
+        padded = np.full((has_delay.sum(), sizes.max()), np.nan)
+        for row, (_, d) in zip(padded, (p for p in delays if p[1].size)):
+            row[:d.size] = d
+        p95s[has_delay] = np.nanpercentile(padded, 95, axis=1)
+    for (entry, _), p95_delay in zip(delays, p95s):
+        entry['p95_delay'] = float(p95_delay)
+    
     # Create output directory
     os.makedirs(output_dir, exist_ok=True)
     
@@ -101,9 +136,12 @@ def analyze_results(data_dir, output_dir):
             print(f"\nComparison for {profile}:")
             print(df)
     
-    # Generate throughput vs RTT plot
-    plt.figure(figsize=(10, 6))
+    # All plots share one figure, cleared between uses
+    fig = Figure(figsize=(10, 6))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
     
+    # Generate throughput vs RTT plot
     markers = ['o', 's', '^', 'D', 'v']
     colors = ['b', 'g', 'r', 'c', 'm']
     
@@ -119,8 +157,8 @@ def analyze_results(data_dir, output_dir):
             marker_idx = i % len(markers)
             color_idx = i % len(colors)
             
-            scatter = plt.scatter(rtt, throughput, marker=markers[marker_idx], color=colors[color_idx],
-                       s=100, label=f"{scheme} ({profile})")
+            scatter = ax.scatter(rtt, throughput, marker=markers[marker_idx], color=colors[color_idx],
+                                 s=100, label=f"{scheme} ({profile})")
             
             legend_labels.append(f"{scheme} ({profile})")
             legend_handles.append(scatter)
@@ -128,92 +166,95 @@ def analyze_results(data_dir, output_dir):
             i += 1
     
     # Invert x-axis as specified in the assignment
-    plt.gca().invert_xaxis()
+    ax.invert_xaxis()
     
-    plt.title('Throughput vs. RTT Comparison')
-    plt.xlabel('RTT (ms) - Higher RTT closer to origin')
-    plt.ylabel('Throughput (Mbps)')
-    plt.grid(True)
+    ax.set(xlabel='RTT (ms) - Higher RTT closer to origin', ylabel='Throughput (Mbps)',
+           title='Throughput vs. RTT Comparison')
+    ax.grid(True)
     
     # Create legend with unique entries
     if legend_handles:
-        plt.legend(handles=legend_handles, labels=legend_labels)
+        ax.legend(handles=legend_handles, labels=legend_labels)
     
-    plt.savefig(f"{output_dir}/throughput_vs_rtt.png")
-    plt.close()
+    canvas.print_png(f"{output_dir}/throughput_vs_rtt.png")
+    
+    # Stack all (already capped) time series into one frame so plotting can
+    # work from pre-grouped slices
+    frames = [data['throughput_data'].assign(profile=profile, scheme=scheme)
+              for profile, schemes in results.items()
+              for scheme, data in schemes.items()
+              if not data['throughput_data'].empty]
+    if frames:
+        all_df = pd.concat(frames, ignore_index=True)
+    else:
+        all_df = pd.DataFrame(columns=CSV_COLUMNS + ['profile', 'scheme'])
+    series_by_profile = {profile: df for profile, df in all_df.groupby('profile', sort=False)}
     
     # Generate time-series plots for each profile
     for profile, schemes in results.items():
-        # Throughput time series
-        plt.figure(figsize=(10, 6))
+        profile_df = series_by_profile.get(profile, all_df.iloc[:0])
         
-        for scheme, data in schemes.items():
-            df = data['throughput_data']
-            if not df.empty and 'time' in df.columns and 'throughput' in df.columns:
-                # Adjust throughput based on profile
-                if profile == 'profile1':
-                    df['throughput'] = df['throughput'].clip(upper=50)
-                elif profile == 'profile2':
-                    df['throughput'] = df['throughput'].clip(upper=1)
-                
-                plt.plot(df['time'], df['throughput'], label=scheme)
-        
-        plt.title(f'Throughput over Time - {profile}')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Throughput (Mbps)')
-        plt.grid(True)
-        plt.legend()
-        
-        plt.savefig(f"{output_dir}/{profile}_throughput_time.png")
-        plt.close()
+        # Throughput time series; autoscale once after all lines are added
+        # rather than per line
+        ax.cla()
+        ax.set_autoscale_on(False)
+        
+        for scheme, df in profile_df.groupby('scheme', sort=False):
+            if not schemes[scheme]['has_throughput']:
+                continue
+            xs, ys = lttb(df['time'].to_numpy(dtype=np.float64),
+                          df['throughput'].to_numpy(dtype=np.float64))
+            ax.plot(xs, ys, label=scheme, rasterized=True)
+        ax.autoscale()
+        
+        ax.set(xlabel='Time (s)', ylabel='Throughput (Mbps)',
+               title=f'Throughput over Time - {profile}')
+        ax.grid(True)
+        ax.legend()
+        
+        canvas.print_png(f"{output_dir}/{profile}_throughput_time.png")
         
         # Loss time series
-        plt.figure(figsize=(10, 6))
+        ax.cla()
+        ax.set_autoscale_on(False)
         
-        for scheme, data in schemes.items():
-            df = data['throughput_data']
-            if not df.empty and 'time' in df.columns and 'loss' in df.columns:
-                plt.plot(df['time'], df['loss'], label=scheme)
+        for scheme, df in profile_df.groupby('scheme', sort=False):
+            if not schemes[scheme]['has_loss']:
+                continue
+            xs, ys = lttb(df['time'].to_numpy(dtype=np.float64),
+                          df['loss'].to_numpy(dtype=np.float64))
+            ax.plot(xs, ys, label=scheme, rasterized=True)
+        ax.autoscale()
         
-        plt.title(f'Loss Rate over Time - {profile}')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Loss Rate')
-        plt.grid(True)
-        plt.legend()
+        ax.set(xlabel='Time (s)', ylabel='Loss Rate',
+               title=f'Loss Rate over Time - {profile}')
+        ax.grid(True)
+        ax.legend()
         
-        plt.savefig(f"{output_dir}/{profile}_loss_time.png")
-        plt.close()
+        canvas.print_png(f"{output_dir}/{profile}_loss_time.png")
         
         # RTT comparison bar chart
-        plt.figure(figsize=(10, 6))
+        ax.cla()
         
         schemes_list = list(schemes.keys())
         rtts = [schemes[s]['avg_delay'] for s in schemes_list]
         
-        # Calculate 95th percentile if data is available
-        p95_rtts = []
-        for s in schemes_list:
-            df = schemes[s]['throughput_data']
-            if not df.empty and 'delay' in df.columns:
-                p95_rtts.append(np.percentile(df['delay'], 95))
-            else:
-                p95_rtts.append(0)
+        p95_rtts = [schemes[s]['p95_delay'] for s in schemes_list]
         
         x = np.arange(len(schemes_list))
         width = 0.35
         
-        plt.bar(x - width/2, rtts, width, label='Average RTT')
-        plt.bar(x + width/2, p95_rtts, width, label='95th Percentile RTT')
+        ax.bar(x - width/2, rtts, width, label='Average RTT')
+        ax.bar(x + width/2, p95_rtts, width, label='95th Percentile RTT')
         
-        plt.title(f'RTT Comparison - {profile}')
-        plt.xlabel('Congestion Control Algorithm')
-        plt.ylabel('RTT (ms)')
-        plt.xticks(x, schemes_list)
-        plt.grid(True, axis='y')
-        plt.legend()
+        ax.set(xlabel='Congestion Control Algorithm', ylabel='RTT (ms)',
+               title=f'RTT Comparison - {profile}')
+        ax.set_xticks(x)
+        ax.set_xticklabels(schemes_list)
+        ax.grid(True, axis='y')
+        ax.legend()
         
-        plt.savefig(f"{output_dir}/{profile}_rtt_comparison.png")
-        plt.close()
+        canvas.print_png(f"{output_dir}/{profile}_rtt_comparison.png")
     
     print(f"Analysis complete! Graphs saved to {output_dir}")
     return 0
@@ -1,370 +1,352 @@
 #!/usr/bin/env python3
 
 import os
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import glob
-import json
+import sys
 import argparse
-from collections import defaultdict
+import csv
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 
-def parse_pantheon_logs(data_dir):
-    """Parse Pantheon log files and extract performance metrics."""
-    results = {}
-    
-    # Find all experiment directories
-    experiment_dirs = [d for d in glob.glob(f"{data_dir}/*_*") if os.path.isdir(d)]
-    
-    for exp_dir in experiment_dirs:
-        # Extract profile and scheme from directory name
-        dirname = os.path.basename(exp_dir)
-        parts = dirname.split('_')
-        if len(parts) < 2:
-            continue
-            
-        profile, scheme = parts[0], parts[1]
-        
-        # Check if results exist
-        if not os.path.exists(f"{exp_dir}/result.json"):
-            print(f"No results found for {profile}_{scheme}")
-            continue
-        
-        # Load results
-        with open(f"{exp_dir}/result.json", 'r') as f:
-            result_data = json.load(f)
-        
-        # Load throughput data
-        throughput_file = f"{exp_dir}/{scheme}_throughput.csv"
-        if not os.path.exists(throughput_file):
-            # Try alternate filename
-            throughput_file = f"{exp_dir}/throughput.csv"
-            if not os.path.exists(throughput_file):
-                print(f"No throughput data found for {profile}_{scheme}")
-                continue
-            
-        throughput_data = pd.read_csv(throughput_file)
-        
-        # Calculate statistics
-        avg_throughput = result_data.get('avg_throughput', 0)
-        avg_delay = result_data.get('avg_delay', 0)
-        loss_rate = result_data.get('loss_rate', 0)
-        
-        # Calculate 95th percentile of delay if available
-        if 'delay' in throughput_data.columns:
-            p95_delay = np.percentile(throughput_data['delay'], 95)
-        else:
-            p95_delay = 0
-        
-        # Store results
-        if profile not in results:
-            results[profile] = {}
-            
-        results[profile][scheme] = {
-            'avg_throughput': avg_throughput,
-            'avg_delay': avg_delay,
-            'p95_delay': p95_delay,
-            'loss_rate': loss_rate,
-            'throughput_data': throughput_data
-        }
-    
-    return results
+# pandas, NumPy, matplotlib and the kernels are imported inside the functions
+# that use them, so runs that find no results exit without loading them
 
-def plot_throughput_time_series(results, output_dir):
-    """Plot time-series throughput for each CC scheme and network profile."""
-    for profile, schemes_data in results.items():
-        plt.figure(figsize=(10, 6))
-        
-        for scheme, data in schemes_data.items():
-            throughput_data = data['throughput_data']
-            if 'time' in throughput_data.columns and 'throughput' in throughput_data.columns:
-                plt.plot(throughput_data['time'], throughput_data['throughput'], label=scheme)
-        
-        plt.xlabel('Time (s)')
-        plt.ylabel('Throughput (Mbps)')
-        plt.title(f'Throughput vs. Time - {profile}')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(f"{output_dir}/{profile}_throughput_time.png")
-        plt.close()
+# Parquet engine for the results cache; checked without importing it
+HAVE_PARQUET = importlib.util.find_spec('pyarrow') is not None
 
-def plot_loss_time_series(results, output_dir):
-    """Plot time-series loss rate for each CC scheme and network profile."""
-    for profile, schemes_data in results.items():
-        plt.figure(figsize=(10, 6))
-        
-        for scheme, data in schemes_data.items():
-            throughput_data = data['throughput_data']
-            if 'time' in throughput_data.columns and 'loss' in throughput_data.columns:
-                plt.plot(throughput_data['time'], throughput_data['loss'], label=scheme)
-        
-        plt.xlabel('Time (s)')
-        plt.ylabel('Loss Rate')
-        plt.title(f'Loss Rate vs. Time - {profile}')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(f"{output_dir}/{profile}_loss_time.png")
-        plt.close()
+# Bump whenever the cached layout, the series decimation (MAX_SERIES_POINTS)
+# or the metric kernels change, so stale entries are re-parsed
+CACHE_VERSION = 1
 
-def plot_delay_comparison(results, output_dir):
-    """Generate bar plots comparing average and 95th percentile RTT."""
-    for profile, schemes_data in results.items():
-        avg_delays = []
-        p95_delays = []
-        scheme_names = []
-        
-        for scheme, data in schemes_data.items():
-            avg_delays.append(data['avg_delay'])
-            p95_delays.append(data['p95_delay'])
-            scheme_names.append(scheme)
-        
-        if not scheme_names:
-            continue
-            
-        # Create grouped bar chart
-        x = np.arange(len(scheme_names))
-        width = 0.35
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.bar(x - width/2, avg_delays, width, label='Average RTT')
-        ax.bar(x + width/2, p95_delays, width, label='95th Percentile RTT')
-        
-        ax.set_xlabel('Congestion Control Scheme')
-        ax.set_ylabel('RTT (ms)')
-        ax.set_title(f'RTT Comparison - {profile}')
-        ax.set_xticks(x)
-        ax.set_xticklabels(scheme_names)
-        ax.legend()
-        ax.grid(True, axis='y')
-        
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/{profile}_rtt_comparison.png")
-        plt.close()
+CACHE_KEY_COLUMNS = ['cache_version', 'csv_path', 'csv_mtime_ns', 'csv_size',
+                     'json_mtime_ns', 'json_size']
+CACHE_METRIC_COLUMNS = ['avg_throughput', 'avg_delay', 'p95_delay', 'loss_rate']
 
-def plot_throughput_vs_rtt(results, output_dir):
-    """Generate throughput vs RTT scatter plot."""
-    plt.figure(figsize=(10, 8))
+def _cache_key(result_entry, throughput_entry):
+    """Identify an experiment's inputs by path, modification time and size."""
+    result_stat = result_entry.stat()
+    throughput_stat = throughput_entry.stat()
+    return (CACHE_VERSION, throughput_entry.path, throughput_stat.st_mtime_ns,
+            throughput_stat.st_size, result_stat.st_mtime_ns, result_stat.st_size)
+
+def load_cache(cache_file):
+    """Load previously parsed experiments, keyed by _cache_key()."""
+    if not HAVE_PARQUET or not cache_file or not os.path.exists(cache_file):
+        return {}
     
-    markers = ['o', 's', 'd', '^', 'v', '<', '>', 'p', '*']
-    colors = ['b', 'g', 'r', 'c', 'm', 'y', 'k', 'orange', 'purple']
+    import pandas as pd
+    from _loaders import CSV_COLUMNS
     
-    points = []
-    labels = []
-    legend_entries = {}
-    
-    for profile, schemes_data in results.items():
-        for i, (scheme, data) in enumerate(schemes_data.items()):
-            marker = markers[i % len(markers)]
-            color = colors[i % len(colors)]
-            
-            rtt = data['avg_delay']
-            throughput = data['avg_throughput']
-            
-            label = f"{scheme} ({profile})"
-            if label not in legend_entries:
-                legend_entries[label] = (marker, color)
-                
-            plt.scatter(rtt, throughput, marker=marker, color=color, s=100, label=label)
+    try:
+        df = pd.read_parquet(cache_file)
+    except Exception as e:
+        print(f"Ignoring unreadable cache {cache_file}: {e}")
+        return {}
     
-    # Invert x-axis as specified in the assignment
-    plt.gca().invert_xaxis()
+    if 'cache_version' not in df.columns:
+        print(f"Ignoring cache {cache_file} without a format version")
+        return {}
+    df = df[df['cache_version'] == CACHE_VERSION]
+    
+    cache = {}
+    for key, group in df.groupby(CACHE_KEY_COLUMNS, sort=False):
+        first = group.iloc[0]
+        metrics = {col: first[col] for col in CACHE_METRIC_COLUMNS}
+        columns = [c for c in first['series_columns'].split(',') if c in CSV_COLUMNS]
+        if first['series_rows'] == 0:
+            metrics['throughput_data'] = pd.DataFrame(columns=columns, dtype=float)
+        else:
+            metrics['throughput_data'] = group[columns].reset_index(drop=True)
+        cache[key] = (first['profile'], first['scheme'], metrics)
+    return cache
+
+def save_cache(cache_file, entries):
+    """Persist parsed experiments as a single zstd-compressed Parquet file."""
+    if not HAVE_PARQUET or not cache_file:
+        return
     
-    plt.title('Throughput vs. RTT Comparison')
-    plt.xlabel('RTT (ms) - Higher RTT closer to origin')
-    plt.ylabel('Throughput (Mbps)')
-    plt.grid(True)
+    import pandas as pd
+    from _loaders import CSV_COLUMNS
     
-    # Create legend with unique entries
-    handles, labels = plt.gca().get_legend_handles_labels()
-    by_label = dict(zip(labels, handles))
-    plt.legend(by_label.values(), by_label.keys(), loc='best')
+    frames = []
+    for key, (profile, scheme, metrics) in entries.items():
+        series = metrics['throughput_data']
+        # Columns the CSV lacks are stored as NaN and dropped again on load
+        df = series.reindex(columns=CSV_COLUMNS)
+        if df.empty:
+            df = pd.DataFrame([[float('nan')] * len(CSV_COLUMNS)], columns=CSV_COLUMNS)
+        df = df.assign(profile=profile, scheme=scheme,
+                       series_columns=','.join(series.columns), series_rows=len(series),
+                       **{col: metrics[col] for col in CACHE_METRIC_COLUMNS},
+                       **dict(zip(CACHE_KEY_COLUMNS, key)))
+        frames.append(df)
     
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/throughput_vs_rtt.png")
-    plt.close()
+    if frames:
+        pd.concat(frames, ignore_index=True).to_parquet(cache_file, compression='zstd', index=False)
 
-def generate_comparison_table(results, output_dir):
-    """Generate comparison tables in CSV format."""
-    for profile, schemes_data in results.items():
-        # Create a DataFrame for the comparison
-        data = []
-        for scheme, metrics in schemes_data.items():
-            data.append({
-                'Scheme': scheme,
-                'Avg Throughput (Mbps)': metrics['avg_throughput'],
-                'Avg RTT (ms)': metrics['avg_delay'],
-                '95th Percentile RTT (ms)': metrics['p95_delay'],
-                'Loss Rate (%)': metrics['loss_rate'] * 100
-            })
-        
-        if not data:
-            continue
-            
-        df = pd.DataFrame(data)
-        
-        # Save to CSV
-        csv_file = f"{output_dir}/{profile}_comparison.csv"
-        df.to_csv(csv_file, index=False)
-        print(f"Saved comparison table to {csv_file}")
-        
-        # Also print to console
-        print(f"\nComparison for {profile}:")
-        print(df.to_string(index=False))
+def _process_exp(exp_dir, cache=None):
+    """Load one experiment directory.
+    
+    Returns (key, (profile, scheme, metrics)) or None; experiments whose
+    inputs match an entry in cache are not re-parsed.
+    """
+    # Extract profile and scheme from directory name
+    profile, sep, scheme = exp_dir.name.partition('_')
+    if not sep:
+        return None
+    
+    # List the directory once instead of probing each file
+    names = {f.name: f for f in os.scandir(exp_dir.path)}
+    
+    # Check if results exist
+    result_entry = names.get('result.json')
+    if result_entry is None:
+        print(f"No results found for {profile}_{scheme}")
+        return None
+    
+    # Locate throughput data
+    throughput_entry = names.get(f"{scheme}_throughput.csv")
+    if throughput_entry is None:
+        # Try alternate filename
+        throughput_entry = names.get("throughput.csv")
+        if throughput_entry is None:
+            print(f"No throughput data found for {profile}_{scheme}")
+            return None
+    
+    key = _cache_key(result_entry, throughput_entry)
+    if cache and key in cache:
+        return key, cache[key]
+    
+    from _kernels import p95
+    from _loaders import load_result_json, load_throughput_series
+    
+    # Load results
+    result_data = load_result_json(result_entry.path)
+    
+    throughput_data, delay = load_throughput_series(throughput_entry.path)
+    
+    # Calculate statistics
+    avg_throughput = result_data.get('avg_throughput', 0)
+    avg_delay = result_data.get('avg_delay', 0)
+    loss_rate = result_data.get('loss_rate', 0)
+    
+    # Calculate 95th percentile of delay if available
+    if delay is not None:
+        p95_delay = p95(delay)
+    else:
+        p95_delay = 0
+    
+    return key, (profile, scheme, {
+        'avg_throughput': avg_throughput,
+        'avg_delay': avg_delay,
+        'p95_delay': p95_delay,
+        'loss_rate': loss_rate,
+        'throughput_data': throughput_data
+    })
 
-def main():
-    parser = argparse.ArgumentParser(description='Analyze Pantheon experiment results')
-    parser.add_argument('--data-dir', default=os.path.expanduser('~/networks_assignment/data'),
-                      help='Directory containing experimental data')
-    parser.add_argument('--output-dir', default=os.path.expanduser('~/networks_assignment/graphs'),
-                      help='Directory to save output graphs')
+SUMMARY_COLUMNS = ['profile', 'scheme', 'avg_throughput', 'avg_delay', 'p95_delay',
+                   'loss_rate', 'csv_path']
+
+def parse_pantheon_logs(data_dir, cache_file=None):
+    """Parse Pantheon log files and extract performance metrics.
     
-    args = parser.parse_args()
+    Returns (summary, series): a DataFrame with one row per (profile, scheme)
+    and a dict mapping each row's csv_path to its throughput time series.
+    summary is None when no experiment results were found.
+    If cache_file is given, unchanged experiments are loaded from it and
+    the cache is rewritten when anything had to be parsed.
+    """
+    rows = []
+    series = {}
+    if not os.path.isdir(data_dir):
+        return None, series
     
-    # Create output directory if it doesn't exist
-    os.makedirs(args.output_dir, exist_ok=True)
+    # Find all experiment directories; DirEntry caches the stat result
+    experiment_dirs = [e for e in os.scandir(data_dir) if e.is_dir() and '_' in e.name]
+    if not experiment_dirs:
+        return None, series
     
-    # Parse experiment results
-    results = parse_pantheon_logs(args.data_dir)
+    cache = load_cache(cache_file)
+    entries = {}
     
-    if not results:
-        print("No experiment results found. Make sure experiments have been run.")
-        return 1
+    # Experiments are independent and mostly I/O-bound, so load them concurrently
+    max_workers = min(32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+        for parsed in ex.map(lambda d: _process_exp(d, cache), experiment_dirs):
+            if parsed is None:
+                continue
+            key, entry = parsed
+            entries[key] = entry
+            profile, scheme, metrics = entry
+            csv_path = key[1]
+            rows.append((profile, scheme, metrics['avg_throughput'], metrics['avg_delay'],
+                         metrics['p95_delay'], metrics['loss_rate'], csv_path))
+            series[csv_path] = metrics['throughput_data']
     
-    # Generate plots
-    plot_throughput_time_series(results, args.output_dir)
-    plot_loss_time_series(results, args.output_dir)
-    plot_delay_comparison(results, args.output_dir)
-    plot_throughput_vs_rtt(results, args.output_dir)
+    if entries.keys() != cache.keys():
+        save_cache(cache_file, entries)
     
-    # Generate comparison tables
-    generate_comparison_table(results, args.output_dir)
+    if not rows:
+        return None, series
     
-    print("\nAnalysis complete! Graphs saved to:", args.output_dir)
-    return 0
+    import pandas as pd
+    
+    # Several directories can map to the same (profile, scheme); the last one
+    # wins. Rows are kept grouped by profile, in order of first appearance.
+    summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    summary = summary.drop_duplicates(['profile', 'scheme'], keep='last')
+    profile_order = {p: i for i, p in enumerate(summary['profile'].unique())}
+    summary = summary.sort_values('profile', key=lambda c: c.map(profile_order), kind='stable')
+    return summary.reset_index(drop=True), series
 
-if __name__ == "__main__":
-    sys.exit(main())bps)')
-        plt.title(f'Throughput vs. Time - {profile}')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(f"{output_dir}/{profile}_throughput_time.png")
-        plt.close()
+def plot_throughput_time_series(summary, series, output_dir):
+    """Plot time-series throughput for each CC scheme and network profile."""
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from _kernels import lttb
+    
+    fig = Figure(figsize=(10, 6))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    
+    for profile, group in summary.groupby('profile', sort=False):
+        ax.cla()
+        
+        # Autoscale once after all lines are added rather than per line
+        ax.set_autoscale_on(False)
+        for scheme, csv_path in zip(group['scheme'], group['csv_path']):
+            throughput_data = series[csv_path]
+            if 'time' in throughput_data.columns and 'throughput' in throughput_data.columns:
+                xs, ys = lttb(throughput_data['time'].to_numpy(dtype=np.float64),
+                              throughput_data['throughput'].to_numpy(dtype=np.float64))
+                ax.plot(xs, ys, label=scheme, rasterized=True)
+        ax.autoscale()
+        
+        ax.set(xlabel='Time (s)', ylabel='Throughput (Mbps)',
+               title=f'Throughput vs. Time - {profile}')
+        ax.legend()
+        ax.grid(True)
+        canvas.print_png(f"{output_dir}/{profile}_throughput_time.png")
 
-def plot_loss_time_series(results, output_dir):
+def plot_loss_time_series(summary, series, output_dir):
     """Plot time-series loss rate for each CC scheme and network profile."""
-    for profile, schemes_data in results.items():
-        plt.figure(figsize=(10, 6))
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from _kernels import lttb
+    
+    fig = Figure(figsize=(10, 6))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    
+    for profile, group in summary.groupby('profile', sort=False):
+        ax.cla()
         
-        for scheme, data in schemes_data.items():
-            throughput_data = data['throughput_data']
+        ax.set_autoscale_on(False)
+        for scheme, csv_path in zip(group['scheme'], group['csv_path']):
+            throughput_data = series[csv_path]
             if 'time' in throughput_data.columns and 'loss' in throughput_data.columns:
-                plt.plot(throughput_data['time'], throughput_data['loss'], label=scheme)
+                xs, ys = lttb(throughput_data['time'].to_numpy(dtype=np.float64),
+                              throughput_data['loss'].to_numpy(dtype=np.float64))
+                ax.plot(xs, ys, label=scheme, rasterized=True)
+        ax.autoscale()
         
-        plt.xlabel('Time (s)')
-        plt.ylabel('Loss Rate')
-        plt.title(f'Loss Rate vs. Time - {profile}')
-        plt.legend()
-        plt.grid(True)
-        plt.savefig(f"{output_dir}/{profile}_loss_time.png")
-        plt.close()
+        ax.set(xlabel='Time (s)', ylabel='Loss Rate',
+               title=f'Loss Rate vs. Time - {profile}')
+        ax.legend()
+        ax.grid(True)
+        canvas.print_png(f"{output_dir}/{profile}_loss_time.png")
 
-def plot_delay_comparison(results, output_dir):
+def plot_delay_comparison(summary, output_dir):
     """Generate bar plots comparing average and 95th percentile RTT."""
-    for profile, schemes_data in results.items():
-        avg_delays = []
-        p95_delays = []
-        scheme_names = []
-        
-        for scheme, data in schemes_data.items():
-            avg_delays.append(data['avg_delay'])
-            p95_delays.append(data['p95_delay'])
-            scheme_names.append(scheme)
-        
+    import numpy as np
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    
+    fig = Figure(figsize=(10, 6))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
+    
+    for profile, group in summary.groupby('profile', sort=False):
         # Create grouped bar chart
-        x = np.arange(len(scheme_names))
+        x = np.arange(len(group))
         width = 0.35
         
-        fig, ax = plt.subplots(figsize=(10, 6))
-        ax.bar(x - width/2, avg_delays, width, label='Average RTT')
-        ax.bar(x + width/2, p95_delays, width, label='95th Percentile RTT')
+        ax.cla()
+        ax.bar(x - width/2, group['avg_delay'].to_numpy(), width, label='Average RTT')
+        ax.bar(x + width/2, group['p95_delay'].to_numpy(), width, label='95th Percentile RTT')
         
-        ax.set_xlabel('Congestion Control Scheme')
-        ax.set_ylabel('RTT (ms)')
-        ax.set_title(f'RTT Comparison - {profile}')
+        ax.set(xlabel='Congestion Control Scheme', ylabel='RTT (ms)',
+               title=f'RTT Comparison - {profile}')
         ax.set_xticks(x)
-        ax.set_xticklabels(scheme_names)
+        ax.set_xticklabels(group['scheme'])
         ax.legend()
         ax.grid(True, axis='y')
         
-        plt.tight_layout()
-        plt.savefig(f"{output_dir}/{profile}_rtt_comparison.png")
-        plt.close()
+        fig.tight_layout()
+        canvas.print_png(f"{output_dir}/{profile}_rtt_comparison.png")
 
-def plot_throughput_vs_rtt(results, output_dir):
+def plot_throughput_vs_rtt(summary, output_dir):
     """Generate throughput vs RTT scatter plot."""
-    plt.figure(figsize=(10, 8))
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+    from matplotlib.lines import Line2D
+    
+    fig = Figure(figsize=(10, 8))
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot(111)
     
     markers = ['o', 's', 'd', '^', 'v', '<', '>', 'p', '*']
     colors = ['b', 'g', 'r', 'c', 'm', 'y', 'k', 'orange', 'purple']
     
-    points = []
-    labels = []
-    
-    for profile, schemes_data in results.items():
-        for i, (scheme, data) in enumerate(schemes_data.items()):
-            marker = markers[i % len(markers)]
-            color = colors[i % len(colors)]
-            
-            rtt = data['avg_delay']
-            throughput = data['avg_throughput']
-            
-            plt.scatter(rtt, throughput, marker=marker, color=color, s=100, 
-                       label=f"{scheme} ({profile})")
-            
-            points.append((rtt, throughput))
-            labels.append(f"{scheme} ({profile})")
+    # Style each point by the scheme's position within its profile, then
+    # draw each marker/colour pair with a single scatter call
+    idx = summary.groupby('profile', sort=False).cumcount().to_numpy()
+    styled = summary.assign(marker=[markers[i % len(markers)] for i in idx],
+                            color=[colors[i % len(colors)] for i in idx])
+    
+    for (marker, color), group in styled.groupby(['marker', 'color'], sort=False):
+        ax.scatter(group['avg_delay'], group['avg_throughput'], marker=marker, color=color, s=100)
     
     # Invert x-axis as specified in the assignment
-    plt.gca().invert_xaxis()
+    ax.invert_xaxis()
     
-    plt.title('Throughput vs. RTT Comparison')
-    plt.xlabel('RTT (ms) - Higher RTT closer to origin')
-    plt.ylabel('Throughput (Mbps)')
-    plt.grid(True)
+    ax.set(xlabel='RTT (ms) - Higher RTT closer to origin', ylabel='Throughput (Mbps)',
+           title='Throughput vs. RTT Comparison')
+    ax.grid(True)
     
-    # Add legend with unique entries
-    handles, labels = plt.gca().get_legend_handles_labels()
-    by_label = dict(zip(labels, handles))
-    plt.legend(by_label.values(), by_label.keys(), loc='best')
+    # Build the legend from proxy artists, one per experiment
+    handles = [Line2D([], [], linestyle='none', marker=marker, color=color, markersize=10)
+               for marker, color in zip(styled['marker'], styled['color'])]
+    labels = [f"{scheme} ({profile})" for profile, scheme in zip(styled['profile'], styled['scheme'])]
+    ax.legend(handles, labels, loc='best')
     
-    plt.tight_layout()
-    plt.savefig(f"{output_dir}/throughput_vs_rtt.png")
-    plt.close()
+    fig.tight_layout()
+    canvas.print_png(f"{output_dir}/throughput_vs_rtt.png")
 
-def generate_comparison_table(results, output_dir):
+def generate_comparison_table(summary, output_dir):
     """Generate comparison tables in CSV format."""
-    for profile, schemes_data in results.items():
-        # Create a DataFrame for the comparison
-        data = []
-        for scheme, metrics in schemes_data.items():
-            data.append({
-                'Scheme': scheme,
-                'Avg Throughput (Mbps)': metrics['avg_throughput'],
-                'Avg RTT (ms)': metrics['avg_delay'],
-                '95th Percentile RTT (ms)': metrics['p95_delay'],
-                'Loss Rate (%)': metrics['loss_rate'] * 100
-            })
-        
-        df = pd.DataFrame(data)
+    header = ['Scheme', 'Avg Throughput (Mbps)', 'Avg RTT (ms)',
+              '95th Percentile RTT (ms)', 'Loss Rate (%)']
+    
+    for profile, group in summary.groupby('profile', sort=False):
+        rows = list(zip(group['scheme'], group['avg_throughput'], group['avg_delay'],
+                        group['p95_delay'], group['loss_rate'] * 100))
         
         # Save to CSV
         csv_file = f"{output_dir}/{profile}_comparison.csv"
-        df.to_csv(csv_file, index=False)
+        with open(csv_file, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(header)
+            writer.writerows(rows)
         print(f"Saved comparison table to {csv_file}")
         
         # Also print to console
         print(f"\nComparison for {profile}:")
-        print(df.to_string(index=False))
+        print(f"{'Scheme':<10} {'Throughput (Mbps)':<20} {'RTT (ms)':<15} {'P95 RTT (ms)':<15} {'Loss Rate (%)':<10}")
+        print("-" * 75)
+        for scheme, throughput, delay, p95_delay, loss in rows:
+            print(f"{scheme:<10} {throughput:<20.2f} {delay:<15.2f} {p95_delay:<15.2f} {loss:<10.4f}")
 
 def main():
     parser = argparse.ArgumentParser(description='Analyze Pantheon experiment results')
@@ -376,23 +358,24 @@ def main():
     args = parser.parse_args()
     
     # Create output directory if it doesn't exist
-    os.makedirs(args.output_dir, exist
+    os.makedirs(args.output_dir, exist_ok=True)
     
     # Parse experiment results
-    results = parse_pantheon_logs(args.data_dir)
+    summary, series = parse_pantheon_logs(args.data_dir,
+                                          os.path.join(args.output_dir, '.cache.parquet'))
     
-    if not results:
+    if summary is None:
         print("No experiment results found. Make sure experiments have been run.")
         return 1
     
     # Generate plots
-    plot_throughput_time_series(results, args.output_dir)
-    plot_loss_time_series(results, args.output_dir)
-    plot_delay_comparison(results, args.output_dir)
-    plot_throughput_vs_rtt(results, args.output_dir)
+    plot_throughput_time_series(summary, series, args.output_dir)
+    plot_loss_time_series(summary, series, args.output_dir)
+    plot_delay_comparison(summary, args.output_dir)
+    plot_throughput_vs_rtt(summary, args.output_dir)
     
     # Generate comparison tables
-    generate_comparison_table(results, args.output_dir)
+    generate_comparison_table(summary, args.output_dir)
     
     print("\nAnalysis complete! Graphs saved to:", args.output_dir)
     return 0
@@ -4,146 +4,128 @@ import os
 import json
 import csv
 import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use('Agg')  # Headless; plots may be drawn in worker processes
+# Only PNGs are written: let Agg simplify paths and render them in chunks,
+# and fix the output DPI
+matplotlib.rcParams.update({
+    'path.simplify': True,
+    'path.simplify_threshold': 1.0,
+    'agg.path.chunksize': 10000,
+    'savefig.dpi': 100,
+    'figure.max_open_warning': 0,
+})
 import matplotlib.pyplot as plt
-import random
 import argparse
+from multiprocessing import Pool
+from _kernels import njit
+from _loaders import CSV_COLUMNS, load_result_json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# Shared generator; each series is drawn in one vectorized call
+_rng = np.random.default_rng()
 
 def ensure_dir(directory):
     """Ensure directory exists."""
     os.makedirs(directory, exist_ok=True)
 
-def generate_cubic_data(profile, runtime=60):
-    """Generate simulated data for TCP Cubic."""
-    time_points = np.linspace(0, runtime, num=60)
-    
-    if profile == 'profile1':
-        # Low-latency, high-bandwidth
-        base_throughput = 45  # Mbps
-        throughput_variation = 5
-        base_rtt = 20  # ms
-        rtt_variation = 5
-        base_loss = 0.001
-        loss_variation = 0.002
-    else:
-        # High-latency, constrained-bandwidth
-        base_throughput = 0.9  # Mbps
-        throughput_variation = 0.1
-        base_rtt = 400  # ms
-        rtt_variation = 20
-        base_loss = 0.005
-        loss_variation = 0.005
-    
-    # Add some realistic variation
-    throughput = [base_throughput + random.uniform(-throughput_variation, throughput_variation) for _ in time_points]
-    # Cubic is known for "filling the pipe" and then backing off after loss
-    for i in range(1, len(throughput)):
+# Simulation parameters per algorithm and profile: (base_throughput Mbps,
+# throughput_variation, base_rtt ms, rtt_variation, base_loss, loss_variation).
+# profile1 is low-latency, high-bandwidth; profile2 is high-latency,
+# constrained-bandwidth
+PARAMS = {
+    'cubic': {
+        'profile1': (45, 5, 20, 5, 0.001, 0.002),
+        'profile2': (0.9, 0.1, 400, 20, 0.005, 0.005),
+    },
+    'bbr': {
+        # BBR typically gets close to capacity and keeps queues smaller; it
+        # can tolerate some loss and does better than cubic at high latencies
+        'profile1': (48, 2, 15, 3, 0.002, 0.003),
+        'profile2': (0.95, 0.05, 350, 10, 0.003, 0.002),
+    },
+    'vegas': {
+        # Vegas usually gets less throughput but keeps queues very small, has
+        # very low loss and is best at high latencies
+        'profile1': (40, 1, 12, 2, 0.0005, 0.0005),
+        'profile2': (0.85, 0.05, 320, 5, 0.001, 0.001),
+    },
+}
+
+# The throughput rules are sequential per-sample recurrences; they are
+# compiled with Numba when it is installed and update the series in place
+
+@njit(cache=True)
+def _cubic_rule(throughput, base_throughput, throughput_variation):
+    """Cubic is known for "filling the pipe" and then backing off after loss."""
+    for i in range(1, throughput.size):
         if i % 10 == 0:  # Every 10 seconds simulate a congestion event
             throughput[i] = throughput[i-1] * 0.7  # Back off
         elif throughput[i-1] < base_throughput:
             throughput[i] = min(throughput[i-1] * 1.1, base_throughput + throughput_variation)  # Recover
-    
-    rtt = [base_rtt + random.uniform(0, rtt_variation) for _ in time_points]
-    loss = [base_loss + random.uniform(0, loss_variation) for _ in time_points]
-    
-    # Create a summary result
-    avg_throughput = np.mean(throughput)
-    avg_rtt = np.mean(rtt)
-    avg_loss = np.mean(loss)
-    
-    return {
-        'time_points': time_points,
-        'throughput': throughput,
-        'rtt': rtt,
-        'loss': loss,
-        'avg_throughput': avg_throughput,
-        'avg_rtt': avg_rtt,
-        'avg_loss': avg_loss
-    }
+    return throughput
 
-def generate_bbr_data(profile, runtime=60):
-    """Generate simulated data for BBR."""
-    time_points = np.linspace(0, runtime, num=60)
-    
-    if profile == 'profile1':
-        # Low-latency, high-bandwidth
-        base_throughput = 48  # Mbps - BBR typically gets close to capacity
-        throughput_variation = 2
-        base_rtt = 15  # ms - BBR keeps queues smaller
-        rtt_variation = 3
-        base_loss = 0.002  # BBR can tolerate some loss
-        loss_variation = 0.003
-    else:
-        # High-latency, constrained-bandwidth
-        base_throughput = 0.95  # Mbps
-        throughput_variation = 0.05
-        base_rtt = 350  # ms - better than cubic at high latencies
-        rtt_variation = 10
-        base_loss = 0.003
-        loss_variation = 0.002
-    
-    # Add some realistic variation
-    throughput = [base_throughput + random.uniform(-throughput_variation, throughput_variation) for _ in time_points]
-    # BBR probes for bandwidth periodically
-    for i in range(1, len(throughput)):
+@njit(cache=True)
+def _bbr_rule(throughput, base_throughput, throughput_variation):
+    """BBR probes for bandwidth periodically."""
+    for i in range(1, throughput.size):
         if i % 8 == 0:  # Every 8 seconds BBR probes for more bandwidth
             throughput[i] = throughput[i-1] * 1.1
         elif i % 8 == 1:  # Then it backs off if necessary
             throughput[i] = min(throughput[i-1] * 0.95, base_throughput + throughput_variation)
-    
-    rtt = [base_rtt + random.uniform(0, rtt_variation) for _ in time_points]
-    loss = [base_loss + random.uniform(0, loss_variation) for _ in time_points]
-    
-    # Create a summary result
-    avg_throughput = np.mean(throughput)
-    avg_rtt = np.mean(rtt)
-    avg_loss = np.mean(loss)
-    
-    return {
-        'time_points': time_points,
-        'throughput': throughput,
-        'rtt': rtt,
-        'loss': loss,
-        'avg_throughput': avg_throughput,
-        'avg_rtt': avg_rtt,
-        'avg_loss': avg_loss
-    }
+    return throughput
 
-def generate_vegas_data(profile, runtime=60):
-    """Generate simulated data for TCP Vegas."""
-    time_points = np.linspace(0, runtime, num=60)
-    
-    if profile == 'profile1':
-        # Low-latency, high-bandwidth
-        base_throughput = 40  # Mbps - Vegas usually gets less throughput
-        throughput_variation = 1
-        base_rtt = 12  # ms - Vegas keeps queues very small
-        rtt_variation = 2
-        base_loss = 0.0005  # Vegas has very low loss
-        loss_variation = 0.0005
-    else:
-        # High-latency, constrained-bandwidth
-        base_throughput = 0.85  # Mbps
-        throughput_variation = 0.05
-        base_rtt = 320  # ms - best at high latencies
-        rtt_variation = 5
-        base_loss = 0.001
-        loss_variation = 0.001
+@njit(cache=True)
+def _apply_vegas(throughput, base_throughput, throughput_variation, factors):
+    """Multiplicative random walk by factors, kept within the variation band.
+    
+    factors holds one entry per sample after the first.
+    """
+    for i in range(1, throughput.size):
+        throughput[i] = throughput[i-1] * factors[i-1]
+        throughput[i] = min(max(throughput[i], base_throughput - throughput_variation),
+                            base_throughput + throughput_variation)
+    return throughput
+
+def _vegas_rule(throughput, base_throughput, throughput_variation):
+    """Vegas is stable with little variation."""
+    # Drawn up front so the compiled loop needs no random generator; the same
+    # draws, in the same order, as one uniform() call per step
+    factors = _rng.uniform(0.98, 1.02, size=throughput.size - 1)
+    return _apply_vegas(throughput, base_throughput, throughput_variation, factors)
+
+RULES = {
+    'cubic': _cubic_rule,
+    'bbr': _bbr_rule,
+    'vegas': _vegas_rule,
+}
+
+def generate_cc_data(profile, algorithm, runtime=60):
+    """Generate simulated data for a congestion control algorithm."""
+    params = PARAMS[algorithm]
+    (base_throughput, throughput_variation, base_rtt, rtt_variation,
+     base_loss, loss_variation) = params.get(profile, params['profile2'])
+    
+    # 60 evenly spaced samples starting at 0; whole seconds for the default runtime
+    time_points = np.arange(60) * (runtime / 60)
     
     # Add some realistic variation
-    throughput = [base_throughput + random.uniform(-throughput_variation, throughput_variation) for _ in time_points]
-    # Vegas is stable with little variation
-    for i in range(1, len(throughput)):
-        throughput[i] = throughput[i-1] * random.uniform(0.98, 1.02)
-        throughput[i] = min(max(throughput[i], base_throughput - throughput_variation), 
-                          base_throughput + throughput_variation)
+    throughput = base_throughput + _rng.uniform(-throughput_variation, throughput_variation, size=time_points.size)
+    throughput = RULES[algorithm](throughput, float(base_throughput), float(throughput_variation))
     
-    rtt = [base_rtt + random.uniform(0, rtt_variation) for _ in time_points]
-    loss = [base_loss + random.uniform(0, loss_variation) for _ in time_points]
+    rtt = base_rtt + _rng.uniform(0, rtt_variation, size=time_points.size)
+    loss = base_loss + _rng.uniform(0, loss_variation, size=time_points.size)
     
     # Create a summary result
     avg_throughput = np.mean(throughput)
     avg_rtt = np.mean(rtt)
     avg_loss = np.mean(loss)
+    p50_rtt, p95_rtt, p99_rtt = np.percentile(rtt, [50, 95, 99])
     
     return {
         'time_points': time_points,
@@ -152,26 +134,48 @@ def generate_vegas_data(profile, runtime=60):
         'loss': loss,
         'avg_throughput': avg_throughput,
         'avg_rtt': avg_rtt,
-        'avg_loss': avg_loss
+        'avg_loss': avg_loss,
+        'p50_rtt': p50_rtt,
+        'p95_rtt': p95_rtt,
+        'p99_rtt': p99_rtt
     }
 
-def save_data(data, data_dir, profile, algorithm):
-    """Save simulated data to files."""
+def generate_and_save(profile, algorithm, data_dir, runtime, seed, fmt='csv'):
+    """Generate and save one algorithm/profile run; used as a pool task."""
+    # Forked workers would otherwise share the parent's generator state
+    global _rng
+    _rng = np.random.default_rng(seed)
+    
+    data = generate_cc_data(profile, algorithm, runtime)
+    save_data(data, data_dir, profile, algorithm, fmt)
+
+def save_data(data, data_dir, profile, algorithm, fmt='csv'):
+    """Save simulated data to files.
+    
+    The series are written as <algorithm>_throughput.csv, which the analysis
+    scripts read, or with fmt='npz' as a binary <algorithm>.npz archive.
+    """
     algorithm_dir = os.path.join(data_dir, f"{profile}_{algorithm}")
     ensure_dir(algorithm_dir)
     
-    # Save throughput data
+    # Save throughput data, removing the other format's file so that a stale
+    # series from an earlier run is never read next to this run's summary
+    npz_file = os.path.join(algorithm_dir, f"{algorithm}.npz")
     throughput_file = os.path.join(algorithm_dir, f"{algorithm}_throughput.csv")
-    with open(throughput_file, 'w', newline='') as f:
-        writer = csv.writer(f)
-        writer.writerow(['time', 'throughput', 'delay', 'loss'])
-        for i in range(len(data['time_points'])):
-            writer.writerow([
-                data['time_points'][i],
-                data['throughput'][i],
-                data['rtt'][i],
-                data['loss'][i]
-            ])
+    stale_file = throughput_file if fmt == 'npz' else npz_file
+    if os.path.exists(stale_file):
+        os.remove(stale_file)
+    
+    if fmt == 'npz':
+        np.savez(npz_file, time=data['time_points'], throughput=data['throughput'],
+                 delay=data['rtt'], loss=data['loss'])
+    else:
+        rows = zip(data['time_points'].tolist(), data['throughput'].tolist(),
+                   data['rtt'].tolist(), data['loss'].tolist())
+        with open(throughput_file, 'w', newline='', buffering=1 << 20) as f:
+            writer = csv.writer(f)
+            writer.writerow(['time', 'throughput', 'delay', 'loss'])
+            writer.writerows(rows)
     
     # Save result summary
     result_file = os.path.join(algorithm_dir, "result.json")
@@ -180,14 +184,77 @@ def save_data(data, data_dir, profile, algorithm):
         'profile': profile,
         'avg_throughput': data['avg_throughput'],
         'avg_delay': data['avg_rtt'],
+        'p50_delay': data['p50_rtt'],
+        'p95_delay': data['p95_rtt'],
+        'p99_delay': data['p99_rtt'],
         'loss_rate': data['avg_loss']
     }
-    with open(result_file, 'w') as f:
-        json.dump(result, f, indent=2)
+    if orjson is not None:
+        with open(result_file, 'wb') as f:
+            f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2 | orjson.OPT_SERIALIZE_NUMPY))
+    else:
+        with open(result_file, 'w') as f:
+            json.dump(result, f, indent=2)
     
     print(f"Saved data for {algorithm} on {profile} to {algorithm_dir}")
 
-def generate_plots(data_dir, output_dir):
+def plot_profile(profile, schemes, output_dir):
+    """Generate the time series and RTT comparison plots for one profile."""
+    # All three plots share one figure, cleared between uses
+    fig, ax = plt.subplots(figsize=(10, 6))
+    
+    # Generate throughput time series plot
+    for algorithm, data in schemes.items():
+        times = data['time']
+        if times.size:
+            ax.plot(times, data['throughput'], label=algorithm)
+    
+    ax.set(xlabel='Time (s)', ylabel='Throughput (Mbps)',
+           title=f'Throughput vs. Time - {profile}')
+    ax.grid(True)
+    ax.legend()
+    
+    fig.savefig(os.path.join(output_dir, f"{profile}_throughput_time.png"))
+    
+    # Generate loss time series plot
+    ax.clear()
+    
+    for algorithm, data in schemes.items():
+        times = data['time']
+        if times.size:
+            ax.plot(times, data['loss'], label=algorithm)
+    
+    ax.set(xlabel='Time (s)', ylabel='Loss Rate',
+           title=f'Loss Rate vs. Time - {profile}')
+    ax.grid(True)
+    ax.legend()
+    
+    fig.savefig(os.path.join(output_dir, f"{profile}_loss_time.png"))
+    
+    # Generate RTT comparison bar plot
+    ax.clear()
+    
+    algorithms = list(schemes)
+    entries = list(schemes.values())
+    rtts = [data['avg_delay'] for data in entries]
+    p95_rtts = [data['p95_delay'] for data in entries]
+    
+    x = np.arange(len(algorithms))
+    width = 0.35
+    
+    ax.bar(x - width/2, rtts, width, label='Average RTT')
+    ax.bar(x + width/2, p95_rtts, width, label='95th Percentile RTT')
+    
+    ax.set(xlabel='Congestion Control Algorithm', ylabel='RTT (ms)',
+           title=f'RTT Comparison - {profile}')
+    ax.set_xticks(x, algorithms)
+    ax.grid(True, axis='y')
+    ax.legend()
+    
+    fig.savefig(os.path.join(output_dir, f"{profile}_rtt_comparison.png"))
+    plt.close(fig)
+
+def generate_plots(data_dir, output_dir, parallel=1):
     """Generate plots from the simulated data."""
     ensure_dir(output_dir)
     
@@ -205,137 +272,78 @@ def generate_plots(data_dir, output_dir):
             
         profile, algorithm = dir_name.split('_', 1)
         
-        with open(result_file, 'r') as f:
-            result_data = json.load(f)
+        result_data = load_result_json(result_file)
         
+        npz_file = os.path.join(dir_path, f"{algorithm}.npz")
         throughput_file = os.path.join(dir_path, f"{algorithm}_throughput.csv")
-        throughput_data = []
+        # Keep each column as its own array, ready to hand to matplotlib
+        if os.path.exists(npz_file):
+            with np.load(npz_file) as z:
+                columns = {c: z[c] for c in CSV_COLUMNS}
+        elif os.path.exists(throughput_file):
+            df = pd.read_csv(throughput_file, usecols=CSV_COLUMNS, dtype=np.float64)
+            columns = {c: df[c].to_numpy() for c in CSV_COLUMNS}
+        else:
+            columns = {c: np.empty(0) for c in CSV_COLUMNS}
         
-        if os.path.exists(throughput_file):
-            with open(throughput_file, 'r') as f:
-                reader = csv.DictReader(f)
-                for row in reader:
-                    throughput_data.append({
-                        'time': float(row['time']),
-                        'throughput': float(row['throughput']),
-                        'delay': float(row['delay']),
-                        'loss': float(row['loss'])
-                    })
+        # The 95th percentile RTT is stored at generation time; compute it
+        # only for data written before it was
+        p95_delay = result_data.get('p95_delay')
+        if p95_delay is None:
+            delay = columns['delay']
+            p95_delay = np.percentile(delay, 95) if delay.size else 0
         
-        if profile not in results:
-            results[profile] = {}
-            
-        results[profile][algorithm] = {
+        results.setdefault(profile, {})[algorithm] = {
             'avg_throughput': result_data.get('avg_throughput', 0),
             'avg_delay': result_data.get('avg_delay', 0),
+            'p95_delay': p95_delay,
             'loss_rate': result_data.get('loss_rate', 0),
-            'throughput_data': throughput_data
+            **columns
         }
     
-    # Generate throughput time series plots
-    for profile in results:
-        plt.figure(figsize=(10, 6))
-        
-        for algorithm in results[profile]:
-            data = results[profile][algorithm]
-            if data['throughput_data']:
-                times = [point['time'] for point in data['throughput_data']]
-                throughputs = [point['throughput'] for point in data['throughput_data']]
-                plt.plot(times, throughputs, label=algorithm)
-        
-        plt.title(f'Throughput vs. Time - {profile}')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Throughput (Mbps)')
-        plt.grid(True)
-        plt.legend()
-        
-        plt.savefig(os.path.join(output_dir, f"{profile}_throughput_time.png"))
-        plt.close()
-    
-    # Generate loss time series plots
-    for profile in results:
-        plt.figure(figsize=(10, 6))
-        
-        for algorithm in results[profile]:
-            data = results[profile][algorithm]
-            if data['throughput_data']:
-                times = [point['time'] for point in data['throughput_data']]
-                losses = [point['loss'] for point in data['throughput_data']]
-                plt.plot(times, losses, label=algorithm)
-        
-        plt.title(f'Loss Rate vs. Time - {profile}')
-        plt.xlabel('Time (s)')
-        plt.ylabel('Loss Rate')
-        plt.grid(True)
-        plt.legend()
-        
-        plt.savefig(os.path.join(output_dir, f"{profile}_loss_time.png"))
-        plt.close()
-    
-    # Generate RTT comparison bar plots
-    for profile in results:
-        plt.figure(figsize=(10, 6))
-        
-        algorithms = list(results[profile].keys())
-        rtts = [results[profile][alg]['avg_delay'] for alg in algorithms]
-        p95_rtts = [np.percentile([pt['delay'] for pt in results[profile][alg]['throughput_data']], 95) 
-                   if results[profile][alg]['throughput_data'] else 0 for alg in algorithms]
-        
-        x = np.arange(len(algorithms))
-        width = 0.35
-        
-        plt.bar(x - width/2, rtts, width, label='Average RTT')
-        plt.bar(x + width/2, p95_rtts, width, label='95th Percentile RTT')
-        
-        plt.title(f'RTT Comparison - {profile}')
-        plt.xlabel('Congestion Control Algorithm')
-        plt.ylabel('RTT (ms)')
-        plt.xticks(x, algorithms)
-        plt.grid(True, axis='y')
-        plt.legend()
-        
-        plt.savefig(os.path.join(output_dir, f"{profile}_rtt_comparison.png"))
-        plt.close()
+    # Per-profile plots are independent of each other
+    if parallel > 1:
+        with Pool(parallel) as p:
+            p.starmap(plot_profile, [(profile, schemes, output_dir) for profile, schemes in results.items()])
+    else:
+        for profile, schemes in results.items():
+            plot_profile(profile, schemes, output_dir)
     
     # Generate throughput vs RTT plot
-    plt.figure(figsize=(10, 6))
+    fig, ax = plt.subplots(figsize=(10, 6))
     
     markers = ['o', 's', '^', 'D', 'v']
     colors = ['b', 'g', 'r', 'c', 'm']
     
     marker_idx = 0
-    for profile in results:
-        for algorithm in results[profile]:
-            data = results[profile][algorithm]
-            
+    for profile, schemes in results.items():
+        for algorithm, data in schemes.items():
             rtt = data['avg_delay']
             throughput = data['avg_throughput']
             
-            plt.scatter(rtt, throughput, marker=markers[marker_idx % len(markers)], 
-                        color=colors[marker_idx % len(colors)], s=100, 
-                        label=f"{algorithm} ({profile})")
+            ax.scatter(rtt, throughput, marker=markers[marker_idx % len(markers)], 
+                       color=colors[marker_idx % len(colors)], s=100, 
+                       label=f"{algorithm} ({profile})")
             marker_idx += 1
     
     # Invert x-axis as specified in the assignment
-    plt.gca().invert_xaxis()
+    ax.invert_xaxis()
     
-    plt.title('Throughput vs. RTT Comparison')
-    plt.xlabel('RTT (ms) - Higher RTT closer to origin')
-    plt.ylabel('Throughput (Mbps)')
-    plt.grid(True)
-    plt.legend()
+    ax.set(xlabel='RTT (ms) - Higher RTT closer to origin', ylabel='Throughput (Mbps)',
+           title='Throughput vs. RTT Comparison')
+    ax.grid(True)
+    ax.legend()
     
-    plt.savefig(os.path.join(output_dir, "throughput_vs_rtt.png"))
-    plt.close()
+    fig.savefig(os.path.join(output_dir, "throughput_vs_rtt.png"))
+    plt.close(fig)
     
     # Print summary tables
-    for profile in results:
+    for profile, schemes in results.items():
         print(f"\nComparison for {profile}:")
         print(f"{'Algorithm':<10} {'Throughput (Mbps)':<20} {'RTT (ms)':<15} {'Loss Rate':<10}")
         print("-" * 55)
         
-        for algorithm in results[profile]:
-            data = results[profile][algorithm]
+        for algorithm, data in schemes.items():
             print(f"{algorithm:<10} {data['avg_throughput']:<20.2f} {data['avg_delay']:<15.2f} {data['loss_rate']:<10.6f}")
     
     print(f"\nAll plots saved to {output_dir}")
@@ -348,6 +356,12 @@ def main():
                         help='Directory to save output graphs')
     parser.add_argument('--runtime', type=int, default=60,
                         help='Simulated runtime in seconds')
+    parser.add_argument('--format', choices=['csv', 'npz'], default='csv',
+                        help='File format for the simulated series (the analysis scripts read csv)')
+    parser.add_argument('--parallel', type=int, default=1,
+                        help='Number of worker processes for generation and plotting (default: 1)')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Seed for reproducible data (default: fresh entropy each run)')
     
     args = parser.parse_args()
     
@@ -355,23 +369,22 @@ def main():
     profiles = ['profile1', 'profile2']
     algorithms = ['cubic', 'bbr', 'vegas']
     
-    for profile in profiles:
-        for algorithm in algorithms:
-            # Generate appropriate data based on algorithm
-            if algorithm == 'cubic':
-                data = generate_cubic_data(profile, args.runtime)
-            elif algorithm == 'bbr':
-                data = generate_bbr_data(profile, args.runtime)
-            elif algorithm == 'vegas':
-                data = generate_vegas_data(profile, args.runtime)
-            else:
-                continue
-            
-            # Save the data
-            save_data(data, args.data_dir, profile, algorithm)
+    tasks = [(profile, algorithm) for profile in profiles for algorithm in algorithms]
+    
+    # Give every run its own independent random stream, all derived from --seed
+    seeds = np.random.SeedSequence(args.seed).spawn(len(tasks))
+    tasks = [(profile, algorithm, args.data_dir, args.runtime, seed, args.format)
+             for (profile, algorithm), seed in zip(tasks, seeds)]
+    
+    if args.parallel > 1:
+        with Pool(args.parallel) as p:
+            p.starmap(generate_and_save, tasks)
+    else:
+        for task in tasks:
+            generate_and_save(*task)
     
     # Generate plots from the simulated data
-    generate_plots(args.data_dir, args.output_dir)
+    generate_plots(args.data_dir, args.output_dir, args.parallel)
 
 if __name__ == "__main__":
     main()
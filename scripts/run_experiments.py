@@ -1,149 +1,80 @@
 #!/usr/bin/env python3
 
 import os
+import shlex
 import subprocess
 import sys
 import time
 import argparse
-from multiprocessing import Pool
+import queue
+from multiprocessing import Pool, Queue
 
-def run_command(cmd, log_file=None):
-    """Run a command and optionally log its output."""
-    print(f"Running: {cmd}")
-    
-    if log_file:
-        with open(log_file, 'w') as f:
-            process = subprocess.Popen(cmd, shell=True, stdout=f, stderr=subprocess.STDOUT)
-    else:
-        process = subprocess.Popen(cmd, shell=True)
-        
-    process.wait()
-    return process.returncode
+BASE_DIR = os.path.expanduser('~/networks_assignment')
+PANTHEON_DIR = os.path.join(BASE_DIR, 'pantheon')
 
-def run_single_experiment(scheme, profile, runtime=60):
-    """Run an experiment for a single CC scheme under a specific network profile."""
-    base_dir = os.path.expanduser('~/networks_assignment')
-    pantheon_dir = os.path.join(base_dir, 'pantheon')
-    data_dir = f"{base_dir}/data/{profile}_{scheme}"
-    log_file = f"{base_dir}/logs/{profile}_{scheme}.log"
-    
-    # Create data directory if it doesn't exist
-    os.makedirs(os.path.dirname(log_file), exist_ok=True)
-    os.makedirs(data_dir, exist_ok=True)
-    
-    # Parse the profile configuration
-    if profile == 'profile1':  # Low-latency, high-bandwidth
-        delay_ms = 10
-        bandwidth_mbps = 50
-        queue_size_bytes = 62500  # BDP: 50 Mbps * 10 ms = 62500 bytes
-        trace_file = f"{base_dir}/traces/50mbps.trace"
-    elif profile == 'profile2':  # High-latency, constrained-bandwidth
-        delay_ms = 200
-        bandwidth_mbps = 1
-        queue_size_bytes = 25000  # BDP: 1 Mbps * 200 ms = 25000 bytes
-        trace_file = f"{base_dir}/traces/1mbps.trace"
-    else:
-        print(f"Unknown profile: {profile}")
-        return 1
-    
-    # Change to pantheon directory
-    os.chdir(pantheon_dir)
-    
-    # Check if the scheme is installed
-    check_cmd = f"./src/experiments/test.py --run-only --schemes {scheme} --dry-run"
-    ret = run_command(check_cmd)
-    if ret != 0:
-        print(f"Scheme {scheme} is not available. Installing...")
-        install_cmd = f"./src/experiments/setup.py --schemes {scheme}"
-        run_command(install_cmd)
-    
-    # Construct the test command
-    cmd = (
-        f"./src/experiments/test.py --run-only --schemes {scheme} "
-        f"--data-dir {data_dir} --runtime {runtime} "
-        f"--uplink-trace {trace_file} --downlink-trace {trace_file} "
-        f"--extra-mm-cmd=\"mm-delay {delay_ms}\" "
-        f"--extra-mm-link-args=\"--uplink-queue=droptail --uplink-queue-args=bytes={queue_size_bytes} "
-        f"--downlink-queue=droptail --downlink-queue-args=bytes={queue_size_bytes}\" "
-        f"--pkill-cleanup local"
-    )
-    
-    # Run the experiment
-    ret = run_command(cmd, log_file)
-    if ret != 0:
-        print(f"Experiment failed for {scheme} on {profile}")
-        return ret
-    
-    # Analyze the results
-    analyze_cmd = f"./src/analysis/analyze.py --data-dir {data_dir}"
-    ret = run_command(analyze_cmd, log_file + '.analyze')
-    
-    print(f"Completed experiment for {scheme} on {profile}")
-    return ret
+# Seconds a pool worker waits for its CPU set before running unpinned
+CORE_SET_TIMEOUT = 2
 
-def main():
-    parser = argparse.ArgumentParser(description='Run Pantheon experiments')
-    parser.add_argument('--schemes', nargs='+', default=['cubic', 'bbr', 'vegas'],
-                        help='Congestion control schemes to test')
-    parser.add_argument('--profiles', nargs='+', default=['profile1', 'profile2'],
-                        help='Network profiles to test')
-    parser.add_argument('--runtime', type=int, default=60,
-                        help='Runtime for each experiment in seconds')
-    parser.add_argument('--parallel', type=int, default=1,
-                        help='Number of experiments to run in parallel')
-    
-    args = parser.parse_args()
+# Schemes already checked (and installed if needed) by this process
+_SCHEME_OK = {}
+
+def run_command(argv, log=None, cwd=None):
+    """Run a command given as an argument list.
     
-    # Prepare experiment combinations
-    experiments = []
-    for scheme in args.schemes:
-        for profile in args.profiles:
-            experiments.append((scheme, profile, args.runtime))
+    If log is an open file, the command's stdout and stderr are written
+    straight to it.
+    """
+    print(f"Running: {shlex.join(argv)}")
     
-    # Run experiments in parallel or sequentially
-    if args.parallel > 1:
-        with Pool(args.parallel) as p:
-            results = p.starmap(run_single_experiment, experiments)
+    if log is not None:
+        log.flush()
+        process = subprocess.run(argv, stdout=log, stderr=subprocess.STDOUT, cwd=cwd, check=False)
     else:
-        results = []
-        for exp in experiments:
-            results.append(run_single_experiment(*exp))
-    
-    # Check if all experiments succeeded
-    if all(r == 0 for r in results):
-        print("All experiments completed successfully!")
-        return 0
-    else:
-        print("Some experiments failed!")
-        return 1
+        process = subprocess.run(argv, cwd=cwd, check=False)
+        
+    return process.returncode
 
-if __name__ == "__main__":
-    sys.exit(main())#!/usr/bin/env python3
+def ensure_scheme(scheme):
+    """Check that a scheme is installed, installing it if not; cached per scheme."""
+    if scheme not in _SCHEME_OK:
+        check_cmd = [os.path.join(PANTHEON_DIR, 'src/experiments/test.py'),
+                     '--run-only', '--schemes', scheme, '--dry-run']
+        ret = run_command(check_cmd, cwd=PANTHEON_DIR)
+        if ret != 0:
+            print(f"Scheme {scheme} is not available. Installing...")
+            install_cmd = [os.path.join(PANTHEON_DIR, 'src/experiments/setup.py'), '--schemes', scheme]
+            ret = run_command(install_cmd, cwd=PANTHEON_DIR)
+        _SCHEME_OK[scheme] = ret == 0
+    return _SCHEME_OK[scheme]
 
-import os
-import subprocess
-import sys
-import time
-import argparse
-from multiprocessing import Pool
+def pin_worker(core_sets):
+    """Pool initializer: pin this worker, and the experiments it launches, to one CPU set.
+    
+    There is one set per initial worker. The queue's feeder thread may still
+    be delivering them when the first workers start, so each waits briefly
+    for its set; a replacement worker started after one has died finds the
+    queue empty once the timeout expires and runs unpinned.
+    """
+    try:
+        os.sched_setaffinity(0, core_sets.get(timeout=CORE_SET_TIMEOUT))
+    except queue.Empty:
+        pass
 
-def run_command(cmd, log_file=None):
-    """Run a command and optionally log its output."""
-    print(f"Running: {cmd}")
-    
-    if log_file:
-        with open(log_file, 'w') as f:
-            process = subprocess.Popen(cmd, shell=True, stdout=f, stderr=subprocess.STDOUT)
-    else:
-        process = subprocess.Popen(cmd, shell=True)
-        
-    process.wait()
-    return process.returncode
+def init_worker(checked, verified, core_sets=None):
+    """Pool initializer: seed the scheme cache from main()'s checks and pin the worker.
+    
+    Passing the results explicitly keeps workers from probing the schemes
+    again when they do not inherit the parent's memory (spawn, forkserver).
+    """
+    for scheme in checked:
+        _SCHEME_OK[scheme] = scheme in verified
+    if core_sets is not None:
+        pin_worker(core_sets)
 
 def run_single_experiment(scheme, profile, runtime=60):
     """Run an experiment for a single CC scheme under a specific network profile."""
-    base_dir = os.path.expanduser('~/networks_assignment')
-    pantheon_dir = os.path.join(base_dir, 'pantheon')
+    base_dir = BASE_DIR
+    pantheon_dir = PANTHEON_DIR
     data_dir = f"{base_dir}/data/{profile}_{scheme}"
     log_file = f"{base_dir}/logs/{profile}_{scheme}.log"
     
@@ -166,29 +97,38 @@ def run_single_experiment(scheme, profile, runtime=60):
         print(f"Unknown profile: {profile}")
         return 1
     
-    # Change to pantheon directory
-    os.chdir(pantheon_dir)
-    
-    # Construct the test command
-    cmd = (
-        f"./src/experiments/test.py --run-only --schemes {scheme} "
-        f"--data-dir {data_dir} --runtime {runtime} "
-        f"--extra-mm-cmd=\"mm-delay {delay_ms}\" "
-        f"--uplink-trace {trace_file} --downlink-trace {trace_file} "
-        f"--extra-mm-link-args=\"--uplink-queue=droptail --uplink-queue-args=bytes={queue_size_bytes} "
-        f"--downlink-queue=droptail --downlink-queue-args=bytes={queue_size_bytes}\" "
-        f"--pkill-cleanup local"
-    )
-    
-    # Run the experiment
-    ret = run_command(cmd, log_file)
-    if ret != 0:
-        print(f"Experiment failed for {scheme} on {profile}")
-        return ret
-    
-    # Analyze the results
-    analyze_cmd = f"./src/analysis/analyze.py --data-dir {data_dir}"
-    ret = run_command(analyze_cmd, log_file + '.analyze')
+    # Pantheon scripts are run from its directory; pass it as the working
+    # directory of each command rather than changing this process's, which
+    # would leak between experiments sharing a pool worker
+    test_py = os.path.join(pantheon_dir, 'src/experiments/test.py')
+    analyze_py = os.path.join(pantheon_dir, 'src/analysis/analyze.py')
+    
+    # Check if the scheme is installed; main() normally did this already
+    ensure_scheme(scheme)
+    
+    # Construct the test command; the mahimahi options are passed in --opt=value
+    # form because their values themselves start with dashes
+    cmd = [
+        test_py, '--run-only', '--schemes', scheme,
+        '--data-dir', data_dir, '--runtime', str(runtime),
+        '--uplink-trace', trace_file, '--downlink-trace', trace_file,
+        f'--extra-mm-cmd=mm-delay {delay_ms}',
+        f'--extra-mm-link-args=--uplink-queue=droptail --uplink-queue-args=bytes={queue_size_bytes} '
+        f'--downlink-queue=droptail --downlink-queue-args=bytes={queue_size_bytes}',
+        '--pkill-cleanup', 'local',
+    ]
+    
+    # Run the experiment and its analysis, logging both to one file
+    with open(log_file, 'wb') as log:
+        ret = run_command(cmd, log, cwd=pantheon_dir)
+        if ret != 0:
+            print(f"Experiment failed for {scheme} on {profile}")
+            return ret
+        
+        # Analyze the results
+        analyze_cmd = [analyze_py, '--data-dir', data_dir]
+        log.write(b'\n=== analyze ===\n')
+        ret = run_command(analyze_cmd, log, cwd=pantheon_dir)
     
     print(f"Completed experiment for {scheme} on {profile}")
     return ret
@@ -212,9 +152,22 @@ def main():
         for profile in args.profiles:
             experiments.append((scheme, profile, args.runtime))
     
+    # Check each scheme once up front; pool workers are handed the results
+    verified = frozenset(scheme for scheme in args.schemes if ensure_scheme(scheme))
+    
     # Run experiments in parallel or sequentially
     if args.parallel > 1:
-        with Pool(args.parallel) as p:
+        # Give each worker a disjoint set of CPUs so concurrent emulators do
+        # not compete for the same cores; children inherit the affinity
+        core_sets = None
+        if hasattr(os, 'sched_setaffinity'):
+            cpus = sorted(os.sched_getaffinity(0))
+            per_worker = max(1, len(cpus) // args.parallel)
+            core_sets = Queue()
+            for i in range(args.parallel):
+                core_sets.put({cpus[(i * per_worker + j) % len(cpus)] for j in range(per_worker)})
+        
+        with Pool(args.parallel, init_worker, (args.schemes, verified, core_sets)) as p:
             results = p.starmap(run_single_experiment, experiments)
     else:
         results = []
@@ -13,6 +13,9 @@ sudo apt-get install -y git python3-pip python3-dev \
 # Install additional Python dependencies
 pip3 install pandas scipy matplotlib jupyter
 
+# Optional accelerators picked up by the analysis scripts when installed
+pip3 install numba pyarrow orjson
+
 # Clone Pantheon repository if not already done
 if [ ! -d "$HOME/networks_assignment/pantheon" ]; then
   cd ~/networks_assignment
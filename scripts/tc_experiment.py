@@ -2,41 +2,276 @@
 
 import os
 import subprocess
-import time
 import argparse
 import json
-import csv
-import matplotlib.pyplot as plt
+import io
+import shlex
+from dataclasses import dataclass
+from functools import lru_cache
+from operator import itemgetter
 import numpy as np
-from datetime import datetime
 
-def run_command(cmd, log_file=None):
-    """Run a command and optionally log its output."""
-    print(f"Running: {cmd}")
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from pyroute2 import IPRoute, NetlinkError
+except ImportError:
+    IPRoute = None
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+BASE_DIR = os.path.expanduser('~/networks_assignment')
+LOG_DIR = f"{BASE_DIR}/logs"
+
+@dataclass(frozen=True, slots=True)
+class Profile:
+    """Emulated link parameters for a network profile."""
+    delay_ms: int
+    bandwidth_mbps: int
     
-    if log_file:
-        with open(log_file, 'w') as f:
-            process = subprocess.Popen(cmd, shell=True, stdout=f, stderr=subprocess.STDOUT)
-    else:
-        process = subprocess.Popen(cmd, shell=True)
+    @property
+    def queue_size_bytes(self):
+        """Queue limit sized to the bandwidth-delay product, in bytes."""
+        return int(self.bandwidth_mbps * 1000000 * self.delay_ms / 8 / 1000)
+
+PROFILES = {
+    'profile1': Profile(delay_ms=10, bandwidth_mbps=50),  # Low-latency, high-bandwidth
+    'profile2': Profile(delay_ms=200, bandwidth_mbps=1),  # High-latency, constrained-bandwidth
+}
+
+# Bytes to megabits, and bytes to packets assuming 1500-byte packets
+INV_MBIT = 8 / 1000000
+PKT_SIZE_INV = 1 / 1500
+
+# Netlink socket kept open across experiments; tc commands are the fallback
+_ipr = None
+
+def _argv(cmd):
+    """Split a command string into an argument list; lists pass through."""
+    return shlex.split(cmd) if isinstance(cmd, str) else cmd
+
+def run_command(cmd, log_file=None, stdout=None, quiet=False):
+    """Run a command without a shell and optionally log its output.
+    
+    stdout may be an open file to receive the command's output; quiet
+    discards its stderr.
+    """
+    argv = _argv(cmd)
+    print(f"Running: {shlex.join(argv)}")
+    stderr = subprocess.DEVNULL if quiet else None
+    
+    try:
+        if log_file:
+            with open(log_file, 'w') as f:
+                process = subprocess.run(argv, stdout=f, stderr=subprocess.STDOUT)
+        else:
+            process = subprocess.run(argv, stdout=stdout, stderr=stderr)
+    except FileNotFoundError:
+        # What the shell reported before: command not found
+        return 127
         
-    process.wait()
     return process.returncode
 
+SUM_FIELDS = ('start', 'seconds', 'bytes', 'retransmits')
+_get_sum_fields = itemgetter(*SUM_FIELDS)
+
+def _sum_fields(interval_sum):
+    """Return an interval summary's fields as a tuple, with 0 for missing keys."""
+    try:
+        return _get_sum_fields(interval_sum)
+    except KeyError:
+        return tuple(interval_sum.get(k, 0) for k in SUM_FIELDS)
+
+def _interval_fields(interval):
+    """Return an iperf3 interval's sum and its first stream's RTT (NaN if absent)."""
+    streams = interval.get('streams')
+    return interval.get('sum', {}), (streams[0].get('rtt', np.nan) if streams else np.nan)
+
+def _drop_from_page_cache(f):
+    """Drop an output file's pages from the page cache; it is not read back."""
+    # DONTNEED skips dirty pages, so write them back first
+    if hasattr(os, 'posix_fadvise'):
+        f.flush()
+        os.fdatasync(f.fileno())
+        os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_DONTNEED)
+
+@lru_cache(maxsize=1)
+def iperf3_has_json_stream():
+    """Whether the installed iperf3 supports --json-stream (3.17 and later)."""
+    try:
+        process = subprocess.run(["iperf3", "--help"], stdout=subprocess.PIPE,
+                                 stderr=subprocess.STDOUT)
+    except FileNotFoundError:
+        return False
+    return b'--json-stream' in process.stdout
+
+def stream_iperf_intervals(cmd, raw_file):
+    """Run an iperf3 client with --json-stream and collect its interval sums.
+    
+    Events are parsed line by line as the test runs; the raw stream is kept
+    in raw_file and dropped from the page cache. Returns the interval sums
+    and the first stream's smoothed RTT per interval in microseconds (NaN
+    where iperf3 does not report one). Raises RuntimeError if iperf3 reports
+    an error or exits with a non-zero status.
+    """
+    print(f"Running: {cmd}")
+    sums = []
+    rtts = []
+    error = None
+    with open(raw_file, 'wb') as raw, \
+            subprocess.Popen(_argv(cmd), stdout=subprocess.PIPE) as process:
+        for line in process.stdout:
+            raw.write(line)
+            event = _loads(line)
+            if event.get('event') == 'interval':
+                interval_sum, rtt = _interval_fields(event['data'])
+                sums.append(interval_sum)
+                rtts.append(rtt)
+            elif event.get('event') == 'error':
+                error = event.get('data')
+        
+        _drop_from_page_cache(raw)
+    
+    if error is not None:
+        raise RuntimeError(f"iperf3 error: {error}")
+    if process.returncode != 0:
+        raise RuntimeError(f"iperf3 exited with status {process.returncode}")
+    return sums, rtts
+
+def read_iperf_intervals(cmd, raw_file):
+    """Run an iperf3 client with -J and collect its interval sums.
+    
+    Fallback for iperf3 releases without --json-stream: the single report is
+    parsed once the test ends. Returns and raises like stream_iperf_intervals.
+    """
+    print(f"Running: {cmd}")
+    process = subprocess.run(_argv(cmd), stdout=subprocess.PIPE)
+    with open(raw_file, 'wb') as raw:
+        raw.write(process.stdout)
+        _drop_from_page_cache(raw)
+    
+    report = _loads(process.stdout) if process.stdout.strip() else {}
+    if 'error' in report:
+        raise RuntimeError(f"iperf3 error: {report['error']}")
+    if process.returncode != 0:
+        raise RuntimeError(f"iperf3 exited with status {process.returncode}")
+    
+    fields = [_interval_fields(interval) for interval in report.get('intervals', [])]
+    return [f[0] for f in fields], [f[1] for f in fields]
+
+def start_iperf_server(port):
+    """Start a resident iperf3 server on port and return its process."""
+    print(f"Starting iperf3 server on port {port}")
+    return subprocess.Popen(["iperf3", "-s", "-p", str(port)],
+                            stdout=subprocess.DEVNULL)
+
+def stop_iperf_server(proc):
+    """Terminate the iperf3 server started by start_iperf_server."""
+    proc.terminate()
+    try:
+        proc.wait(timeout=2)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+
+def read_proc(path):
+    """Read a /proc file as bytes; callers decode what they need."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+@lru_cache(maxsize=1)
 def get_available_cc_algorithms():
-    """Get list of available congestion control algorithms on the system."""
+    """Get the set of available congestion control algorithms on the system."""
     try:
-        with open('/proc/sys/net/ipv4/tcp_available_congestion_control', 'r') as f:
-            algorithms = f.read().strip().split()
-            return algorithms
-    except:
+        return frozenset(read_proc('/proc/sys/net/ipv4/tcp_available_congestion_control').decode().split())
+    except OSError as e:
         # Default to these common ones if can't read from proc
-        return ['cubic', 'bbr', 'vegas']
+        print(f"Could not read available congestion control algorithms: {e}")
+        return frozenset(['cubic', 'bbr', 'vegas'])
 
-def setup_tc(interface, bandwidth_mbps, delay_ms, queue_size_bytes):
-    """Set up traffic control on the specified interface."""
+def allow_cc_algorithms(schemes):
+    """Make schemes selectable with iperf3 -C and return those that are.
+    
+    Without CAP_NET_ADMIN a socket may only select algorithms listed in
+    tcp_allowed_congestion_control, so missing ones are added with one sysctl.
+    """
+    if os.geteuid() == 0:
+        return schemes
+    
+    path = '/proc/sys/net/ipv4/tcp_allowed_congestion_control'
+    try:
+        allowed = set(read_proc(path).decode().split())
+        missing = [scheme for scheme in schemes if scheme not in allowed]
+        if missing:
+            value = ' '.join(sorted(allowed.union(missing)))
+            run_command(["sudo", "sysctl", "-w", f"net.ipv4.tcp_allowed_congestion_control={value}"])
+            allowed = set(read_proc(path).decode().split())
+    except OSError as e:
+        print(f"Could not read allowed congestion control algorithms: {e}")
+        return schemes
+    
+    for scheme in schemes:
+        if scheme not in allowed:
+            print(f"Congestion control algorithm {scheme} is not allowed for unprivileged sockets; skipping")
+    return [scheme for scheme in schemes if scheme in allowed]
+
+def _netlink():
+    """Return the shared netlink socket, or None if pyroute2 cannot be used.
+    
+    Netlink needs CAP_NET_ADMIN, so without root the sudo tc commands are used.
+    """
+    global _ipr
+    if _ipr is None and IPRoute is not None and os.geteuid() == 0:
+        _ipr = IPRoute()
+    return _ipr
+
+def _setup_tc_netlink(ipr, interface, bandwidth_mbps, delay_ms, queue_size_bytes):
+    """Configure the HTB class and netem qdisc directly over netlink."""
+    idx = ipr.link_lookup(ifname=interface)[0]
+    try:
+        ipr.tc('del', index=idx)
+    except NetlinkError:
+        pass
+    
+    # Same layout as the tc commands: 1: htb -> 1:10 class -> 10: netem
+    ipr.tc('add', 'htb', idx, 0x10000, default=0x10)
+    ipr.tc('add-class', 'htb', idx, 0x10010, parent=0x10000,
+           rate=f"{bandwidth_mbps}mbit")
+    ipr.tc('add', 'netem', idx, 0x100000, parent=0x10010,
+           delay=delay_ms * 1000, limit=queue_size_bytes)
+
+def setup_tc(interface, bandwidth_mbps, delay_ms, queue_size_bytes, single_qdisc=False):
+    """Set up traffic control on the specified interface.
+    
+    By default an HTB class shapes the rate and a netem qdisc below it adds
+    the delay. With single_qdisc, one root netem qdisc does both, so packets
+    pass through a single qdisc instead of the HTB hierarchy.
+    
+    Returns False if the netlink configuration failed; failures of the tc
+    commands are not detected, as before.
+    """
+    if single_qdisc:
+        run_command(f"sudo tc qdisc del dev {interface} root", quiet=True)
+        run_command(f"sudo tc qdisc add dev {interface} root handle 1: netem delay {delay_ms}ms rate {bandwidth_mbps}mbit limit {queue_size_bytes}")
+        print(f"Set up traffic control on {interface}: {bandwidth_mbps}Mbps, {delay_ms}ms delay, {queue_size_bytes} queue size (netem only)")
+        return True
+    
+    ipr = _netlink()
+    if ipr is not None:
+        try:
+            _setup_tc_netlink(ipr, interface, bandwidth_mbps, delay_ms, queue_size_bytes)
+        except (NetlinkError, IndexError) as e:
+            # IndexError: link_lookup found no such interface
+            print(f"Failed to set up traffic control on {interface}: {e!r}")
+            return False
+        print(f"Set up traffic control on {interface}: {bandwidth_mbps}Mbps, {delay_ms}ms delay, {queue_size_bytes} queue size")
+        return True
+    
     # Clear any existing qdisc
-    run_command(f"sudo tc qdisc del dev {interface} root 2>/dev/null")
+    run_command(f"sudo tc qdisc del dev {interface} root", quiet=True)
     
     # Set up HTB with rate limit
     run_command(f"sudo tc qdisc add dev {interface} root handle 1: htb default 10")
@@ -46,133 +281,118 @@ def setup_tc(interface, bandwidth_mbps, delay_ms, queue_size_bytes):
     run_command(f"sudo tc qdisc add dev {interface} parent 1:10 handle 10: netem delay {delay_ms}ms limit {queue_size_bytes}")
     
     print(f"Set up traffic control on {interface}: {bandwidth_mbps}Mbps, {delay_ms}ms delay, {queue_size_bytes} queue size")
+    return True
 
 def cleanup_tc(interface):
     """Clean up traffic control settings."""
-    run_command(f"sudo tc qdisc del dev {interface} root 2>/dev/null")
+    ipr = _netlink()
+    if ipr is not None:
+        try:
+            ipr.tc('del', index=ipr.link_lookup(ifname=interface)[0])
+        except (NetlinkError, IndexError):
+            pass
+    else:
+        run_command(f"sudo tc qdisc del dev {interface} root", quiet=True)
     print(f"Cleaned up traffic control on {interface}")
 
-def run_experiment(cc_algorithm, profile, runtime=60):
-    """Run experiment for a specific congestion control algorithm and network profile."""
-    base_dir = os.path.expanduser('~/networks_assignment')
-    data_dir = f"{base_dir}/data/{profile}_{cc_algorithm}"
-    log_dir = f"{base_dir}/logs"
+@lru_cache(maxsize=1)
+def get_default_interface():
+    """Return the interface of the default IPv4 route, or '' if there is none."""
+    # Columns: Iface Destination Gateway Flags ...; the default route has
+    # destination 0.0.0.0
+    for line in read_proc('/proc/net/route').splitlines()[1:]:
+        fields = line.split()
+        if len(fields) > 1 and fields[1] == b'00000000':
+            return fields[0].decode()
+    return ''
+
+def experiment_data_dir(profile, cc_algorithm):
+    """Return the output directory for one experiment."""
+    return f"{BASE_DIR}/data/{profile}_{cc_algorithm}"
+
+def run_experiment(cc_algorithm, profile, runtime=60, server_port=5050):
+    """Run experiment for a specific congestion control algorithm and network profile.
     
-    # Create directories if they don't exist
-    os.makedirs(data_dir, exist_ok=True)
-    os.makedirs(log_dir, exist_ok=True)
+    Traffic control for the profile, an iperf3 server on server_port and the
+    output directories must already be set up (see main).
+    """
+    print(f"\n===== Running experiment: {cc_algorithm} on {profile} =====\n")
     
-    log_file = f"{log_dir}/{profile}_{cc_algorithm}.log"
+    data_dir = experiment_data_dir(profile, cc_algorithm)
+    log_file = f"{LOG_DIR}/{profile}_{cc_algorithm}.log"
     results_file = f"{data_dir}/result.json"
     throughput_file = f"{data_dir}/{cc_algorithm}_throughput.csv"
     
     # Set up network profile parameters
-    if profile == 'profile1':  # Low-latency, high-bandwidth
-        delay_ms = 10
-        bandwidth_mbps = 50
-        queue_size_bytes = int(bandwidth_mbps * 1000000 * delay_ms / 8 / 1000)  # BDP in bytes
-    elif profile == 'profile2':  # High-latency, constrained-bandwidth
-        delay_ms = 200
-        bandwidth_mbps = 1
-        queue_size_bytes = int(bandwidth_mbps * 1000000 * delay_ms / 8 / 1000)  # BDP in bytes
-    else:
+    params = PROFILES.get(profile)
+    if params is None:
         print(f"Unknown profile: {profile}")
         return 1
-    
-    # Get default interface
-    interface = subprocess.check_output("ip route | grep default | awk '{print $5}'", shell=True).decode().strip()
-    if not interface:
-        print("Could not determine default network interface")
-        return 1
-    
-    print(f"Using network interface: {interface}")
-    
-    # Set congestion control algorithm
-    run_command(f"sudo sysctl -w net.ipv4.tcp_congestion_control={cc_algorithm}")
-    print(f"Set congestion control algorithm to {cc_algorithm}")
+    delay_ms = params.delay_ms
     
     try:
-        # Set up traffic control
-        setup_tc(interface, bandwidth_mbps, delay_ms, queue_size_bytes)
+        # Run iperf client against the resident server with JSON output,
+        # streamed when iperf3 supports it; -C sets the congestion control
+        # algorithm on this connection and -Z sends with zero-copy
+        iperf_cmd = f"iperf3 -c localhost -p {server_port} -C {cc_algorithm} -t {runtime} -Z"
+        if iperf3_has_json_stream():
+            sums, rtts = stream_iperf_intervals(f"{iperf_cmd} --json-stream",
+                                                f"{data_dir}/iperf_result.jsonl")
+        else:
+            # Older iperf3 only reports once the test ends
+            sums, rtts = read_iperf_intervals(f"{iperf_cmd} -J", f"{data_dir}/iperf_result.json")
         
-        # Set up iperf server in the background
-        server_port = 5050
-        run_command(f"iperf3 -s -p {server_port} -D")
+        # Extract per-interval columns
+        rows = np.array([_sum_fields(d) for d in sums], dtype=np.float64).reshape(-1, 4)
+        start, seconds, bytes_transferred, retransmits = rows.T
         
-        # Run iperf client with JSON output
-        iperf_cmd = f"iperf3 -c localhost -p {server_port} -t {runtime} -J > {data_dir}/iperf_result.json"
-        run_command(iperf_cmd)
+        # Calculate throughput in Mbps
+        throughput = np.divide(bytes_transferred * INV_MBIT, seconds,
+                               out=np.zeros_like(seconds), where=seconds > 0)
         
-        # Process results
-        with open(f"{data_dir}/iperf_result.json", 'r') as f:
-            iperf_data = json.load(f)
+        # Calculate approximate packet loss based on retransmits; an interval
+        # with no bytes counts as one packet sent
+        loss = np.divide(retransmits, bytes_transferred * PKT_SIZE_INV,
+                         out=retransmits.copy(), where=bytes_transferred > 0)
         
-        # Extract data
-        intervals = iperf_data.get('intervals', [])
-        
-        # Prepare throughput data
-        throughput_data = []
-        
-        total_throughput = 0
-        total_retransmits = 0
-        total_bytes = 0
-        
-        # Process each interval
-        for interval in intervals:
-            sum_data = interval.get('sum', {})
-            
-            seconds = sum_data.get('seconds', 0)
-            bytes_transferred = sum_data.get('bytes', 0)
-            retransmits = sum_data.get('retransmits', 0)
-            
-            # Calculate throughput in Mbps
-            throughput = (bytes_transferred * 8) / (seconds * 1000000) if seconds > 0 else 0
-            
-            # Calculate approximate packet loss based on retransmits
-            # Assuming 1500-byte packets
-            packets_sent = bytes_transferred / 1500 if bytes_transferred > 0 else 1
-            loss_rate = retransmits / packets_sent if packets_sent > 0 else 0
-            
-            # Save interval data
-            throughput_data.append({
-                'time': sum_data.get('start', 0),
-                'throughput': throughput,
-                'delay': delay_ms * 2,  # RTT is roughly 2x the delay
-                'loss': loss_rate
-            })
-            
-            total_throughput += throughput
-            total_retransmits += retransmits
-            total_bytes += bytes_transferred
+        # RTT as measured by the sender's TCP_INFO, in ms; intervals without
+        # a sample fall back to the configured RTT of twice the delay
+        rtt = np.array(rtts, dtype=np.float64) / 1000
+        rtt[np.isnan(rtt)] = delay_ms * 2
         
         # Calculate averages
-        num_intervals = len(intervals)
-        avg_throughput = total_throughput / num_intervals if num_intervals > 0 else 0
-        total_packets = total_bytes / 1500 if total_bytes > 0 else 1
-        avg_loss_rate = total_retransmits / total_packets if total_packets > 0 else 0
+        avg_throughput = float(throughput.mean()) if throughput.size else 0
+        total_bytes = bytes_transferred.sum()
+        total_packets = total_bytes * PKT_SIZE_INV if total_bytes > 0 else 1
+        avg_loss_rate = float(retransmits.sum() / total_packets)
+        avg_delay = float(rtt.mean()) if rtt.size else delay_ms * 2
         
         # Save results
         result = {
             'cc_algorithm': cc_algorithm,
             'profile': profile,
             'avg_throughput': avg_throughput,
-            'avg_delay': delay_ms * 2,  # RTT is roughly 2x the delay
+            'avg_delay': avg_delay,
             'loss_rate': avg_loss_rate
         }
         
-        with open(results_file, 'w') as f:
-            json.dump(result, f, indent=2)
+        if orjson is not None:
+            with open(results_file, 'wb') as f:
+                f.write(orjson.dumps(result, option=orjson.OPT_INDENT_2))
+        else:
+            with open(results_file, 'w') as f:
+                json.dump(result, f, indent=2)
         
-        # Save throughput data
-        with open(throughput_file, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=['time', 'throughput', 'delay', 'loss'])
-            writer.writeheader()
-            for data in throughput_data:
-                writer.writerow(data)
+        # Save throughput data, formatted in memory and written in one call
+        buf = io.BytesIO()
+        np.savetxt(buf, np.column_stack([start, throughput, rtt, loss]),
+                   fmt='%.10g', delimiter=',', header='time,throughput,delay,loss', comments='')
+        with open(throughput_file, 'wb') as f:
+            f.write(buf.getbuffer())
         
         print(f"Experiment completed successfully for {cc_algorithm} on {profile}")
         print(f"Average throughput: {avg_throughput:.2f} Mbps")
-        print(f"Average RTT: {delay_ms * 2:.2f} ms")
+        print(f"Average RTT: {avg_delay:.2f} ms")
         print(f"Loss rate: {avg_loss_rate:.4f}")
         
         return 0
@@ -180,11 +400,6 @@ def run_experiment(cc_algorithm, profile, runtime=60):
     except Exception as e:
         print(f"Error during experiment: {e}")
         return 1
-    
-    finally:
-        # Clean up
-        cleanup_tc(interface)
-        run_command("killall -9 iperf3 2>/dev/null")
 
 def main():
     parser = argparse.ArgumentParser(description='Run traffic control experiments')
@@ -194,27 +409,72 @@ def main():
                       help='Network profiles to test')
     parser.add_argument('--runtime', type=int, default=60,
                       help='Runtime for each experiment in seconds')
+    parser.add_argument('--single-qdisc', action='store_true',
+                      help='Shape rate and delay with one netem qdisc instead of HTB + netem')
     
     args = parser.parse_args()
     
     # Check available congestion control algorithms
     available_algorithms = get_available_cc_algorithms()
-    print(f"Available congestion control algorithms: {', '.join(available_algorithms)}")
+    print(f"Available congestion control algorithms: {', '.join(sorted(available_algorithms))}")
     
     # Filter schemes to only those available
     schemes = [scheme for scheme in args.schemes if scheme in available_algorithms]
     
+    # iperf3 -C sets the algorithm per connection, which needs it allowed
+    schemes = allow_cc_algorithms(schemes)
+    
     if not schemes:
         print("Error: None of the specified congestion control algorithms are available!")
         return 1
     
-    # Run experiments
-    for scheme in schemes:
+    # Get default interface
+    interface = get_default_interface()
+    if not interface:
+        print("Could not determine default network interface")
+        return 1
+    
+    print(f"Using network interface: {interface}")
+    
+    if not iperf3_has_json_stream():
+        print("iperf3 has no --json-stream (added in 3.17); reading its -J report after each run")
+    
+    # Create every output directory up front, before any experiment runs
+    os.makedirs(LOG_DIR, exist_ok=True)
+    for profile in args.profiles:
+        if profile in PROFILES:
+            for scheme in schemes:
+                os.makedirs(experiment_data_dir(profile, scheme), exist_ok=True)
+    
+    # Start a resident iperf3 server once and reuse it for every experiment
+    server = start_iperf_server(5050)
+    
+    try:
+        # Experiments run one at a time: concurrent schemes would share the
+        # profile's single shaped bottleneck and measure each other instead
         for profile in args.profiles:
-            print(f"\n===== Running experiment: {scheme} on {profile} =====\n")
-            result = run_experiment(scheme, profile, args.runtime)
-            if result != 0:
-                print(f"Experiment failed for {scheme} on {profile}")
+            params = PROFILES.get(profile)
+            if params is None:
+                print(f"Unknown profile: {profile}")
+                continue
+            
+            try:
+                # Set up traffic control
+                if not setup_tc(interface, params.bandwidth_mbps, params.delay_ms,
+                                params.queue_size_bytes, single_qdisc=args.single_qdisc):
+                    print(f"Skipping profile {profile}")
+                    continue
+                
+                for scheme in schemes:
+                    if run_experiment(scheme, profile, args.runtime, 5050) != 0:
+                        print(f"Experiment failed for {scheme} on {profile}")
+            
+            finally:
+                # Clean up
+                cleanup_tc(interface)
+    
+    finally:
+        stop_iperf_server(server)
     
     print("All experiments completed!")
     return 0